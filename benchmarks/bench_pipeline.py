@@ -0,0 +1,260 @@
+"""
+전체 파이프라인 벤치마크 (실제 계정/네트워크 없이 로컬 스텁 서버로 실행)
+
+    python benchmarks/bench_pipeline.py [옵션]
+      --scenarios fetch,render,db,history,history_cached,upload,daily   실행할 측정 항목 (기본: 전부)
+      --records 1000,10000,100000                db(save_to_json) / history(가격 이력 분석) 측정 기록 수
+                                                 (history_cached: DB 저장 때 만든 가격 이력 캐시가 있는 평소 실행)
+      --latency 0.05 --error-rate 0.0            스텁 응답 지연(초) / 503 확률 (쿠팡/CDN/텔레그램)
+      --graph-delay 1.0 --pages-delay 2.0        인스타 컨테이너 처리 지연 / 페이지 반영 지연
+      --feeds goldbox,best:1016,search:생수       수집할 쿠팡 피드 (COUPANG_FEEDS, 기본: goldbox)
+      --coupang-quota 50                         쿠팡 스텁 분당 허용 호출 수 (넘으면 429)
+      --out results.json                         결과 저장 경로 (기본 .cache/bench/<시각>.json)
+      --compare 이전결과.json                     이전 결과와 비교 출력
+
+임시 폴더에 작업 공간(src/templates/fonts 는 링크, images/data/.git 은 새로)을 만들고
+각 항목을 별도 프로세스에서 실행합니다. 모듈의 BASE_DIR 가 작업 공간을 가리키므로
+저장소의 data/ 나 index.html 은 건드리지 않습니다.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LINKED = ["src", "templates", "fonts", "benchmarks", "main.py"]
+ITEMS_FILE = os.path.join(".cache", "bench_items.json")
+RESULT_MARK = "BENCH_RESULT "
+
+# ============================================================================
+# 작업 공간 준비 (부모 프로세스)
+# ============================================================================
+def make_workspace():
+    workspace = tempfile.mkdtemp(prefix="3ilab_bench_")
+    for name in LINKED:
+        os.symlink(os.path.join(ROOT, name), os.path.join(workspace, name))
+    for name in ("images", "data", ".cache"):
+        os.makedirs(os.path.join(workspace, name))
+    with open(os.path.join(workspace, ".gitignore"), "w") as f:
+        f.write(".cache/\n" + "\n".join(LINKED) + "\n")
+
+    # git_deploy 가 push 할 로컬 원격 저장소
+    remote = os.path.join(workspace, ".cache", "remote.git")
+    git = lambda *args: subprocess.run(["git"] + list(args), cwd=workspace, check=True, capture_output=True)
+    git("init", "-q", "--bare", remote)
+    git("init", "-q")
+    git("checkout", "-q", "-b", "main")
+    git("remote", "add", "origin", remote)
+    git("add", ".gitignore")
+    git("-c", "user.email=bench@localhost", "-c", "user.name=bench", "commit", "-q", "-m", "bench workspace")
+    git("push", "-q", "origin", "main")
+    return workspace
+
+def stub_env(workspace, coupang, cdn, graph, telegram):
+    env = dict(os.environ)
+    env.update({
+        "COUPANG_API_BASE": coupang.base_url, "COUPANG_ACCESS_KEY": "stub-access", "COUPANG_SECRET_KEY": "stub-secret",
+        "GRAPH_API_BASE": graph.base_url, "INSTA_PAGE_ID": "1", "INSTA_ACCESS_TOKEN": "stub-token",
+        "GITHUB_ID": "stub", "GH_ID": "stub", "PAGES_BASE_URL": cdn.origin,
+        "TELEGRAM_API_BASE": telegram.base_url, "TELEGRAM_BOT_TOKEN": "stub", "TELEGRAM_CHAT_ID": "1",
+        "GIT_AUTHOR_NAME": "bench", "GIT_AUTHOR_EMAIL": "bench@localhost",
+        "GIT_COMMITTER_NAME": "bench", "GIT_COMMITTER_EMAIL": "bench@localhost",
+        "METRICS_DIR": os.path.join(workspace, ".cache", "reports"),
+        "PYTHONPATH": workspace,
+    })
+    return env
+
+def run_worker(workspace, env, scenario, extra=()):
+    cmd = [sys.executable, "-m", "benchmarks.bench_pipeline", "--worker", scenario] + list(extra)
+    proc = subprocess.run(cmd, cwd=workspace, env=env, capture_output=True, text=True)
+    with open(os.path.join(workspace, ".cache", "bench.log"), "a", encoding="utf-8") as f:
+        f.write(f"\n===== {scenario} {' '.join(extra)} =====\n{proc.stdout}\n{proc.stderr}")
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith(RESULT_MARK):
+            return json.loads(line[len(RESULT_MARK):])
+    tail = (proc.stdout + proc.stderr).strip().splitlines()[-10:]
+    return {"scenario": scenario, "status": "crashed", "elapsed": None, "log_tail": tail}
+
+# ============================================================================
+# 측정 항목 (작업 공간 안의 자식 프로세스에서 실행)
+# ============================================================================
+def seed_records(count, latest_date):
+    """data/ 를 비우고 하루 10개씩 count 개의 과거 기록을 products.json 에 만듭니다."""
+    from datetime import datetime, timedelta
+    for path in ("data", "index.html"):
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+    latest = datetime.strptime(latest_date, "%Y%m%d")
+    records = []
+    for i in range(count):
+        date_str = (latest - timedelta(days=i // 10 + 1)).strftime("%Y%m%d")
+        rank = i % 10 + 1
+        records.append({"id": f"{date_str}-{rank:02d}", "date": date_str, "rank": rank,
+                        "name": f"벤치 상품 {i % 997} 특가 세트 {rank}개입", "price": 1000 + i % 50000,
+                        "image_url": f"https://example.invalid/{i}.jpg", "link": f"https://link.coupang.com/a/b{i}"})
+    os.makedirs("data")
+    with open(os.path.join("data", "products.json"), "w", encoding="utf-8") as f:
+        json.dump(records, f, ensure_ascii=False)
+
+def load_items():
+    with open(ITEMS_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def worker(scenario, records):
+    from src import metrics, http_client
+    result = {"scenario": scenario, "status": "ok"}
+    if scenario in ("db", "history", "history_cached"):
+        result["records"] = records
+
+    # 준비 작업 (시간 측정 제외)
+    if scenario in ("db", "history", "history_cached"):
+        seed_records(records, load_items()[0]['date'])
+        if scenario == "history_cached":
+            # 실제 실행에서는 전날 DB 저장 단계가 캐시를 만들어 둠
+            from src import price_history, product_store
+            price_history.refresh_cache(product_store.load_all())
+    elif scenario == "daily":
+        seed_records(records, load_items()[0]['date'])
+    metrics.reset()
+
+    start = time.perf_counter()
+    try:
+        if scenario == "fetch":
+            from src import fetch_data
+            items = fetch_data.get_goldbox_items(limit=10)
+            with open(ITEMS_FILE, "w", encoding="utf-8") as f:
+                json.dump(items, f, ensure_ascii=False)
+        elif scenario == "render":
+            from src import make_image
+            make_image.main(load_items())
+        elif scenario == "db":
+            from src import update_db
+            update_db.save_to_json(load_items())
+        elif scenario in ("history", "history_cached"):
+            from src import price_history
+            price_history.annotate(load_items())
+        elif scenario == "upload":
+            from src import upload_insta
+            upload_insta.main(load_items())
+        elif scenario == "daily":
+            import main
+            main.run_daily_job()
+    except SystemExit as e:
+        result["status"] = "failed" if e.code else "ok"
+    except Exception as e:
+        result["status"] = f"failed: {e}"
+
+    result["elapsed"] = round(time.perf_counter() - start, 3)
+    result["aggregate"] = metrics.aggregate()
+    result["counters"] = dict(metrics.counters)
+    result["http"] = {host: s["requests"] for host, s in http_client.stats.items()}
+    print(RESULT_MARK + json.dumps(result, ensure_ascii=False))
+
+# ============================================================================
+# 결과 출력
+# ============================================================================
+def result_key(result):
+    return result["scenario"] + (f"@{result['records']}" if "records" in result else "")
+
+def print_results(results, baseline=None):
+    base = {result_key(r): r for r in (baseline or {}).get("results", [])}
+    print("\n⏱️ [벤치마크 결과]")
+    for r in results:
+        key = result_key(r)
+        elapsed = f"{r['elapsed']:.2f}s" if r.get("elapsed") is not None else "-"
+        line = f"   - {key:<22} {elapsed:>9}  ({r['status']})"
+        old = base.get(key, {}).get("elapsed")
+        if old and r.get("elapsed"):
+            line += f"  | 이전 {old:.2f}s -> {r['elapsed'] / old:.2f}배"
+        print(line)
+        if r["status"] == "crashed":
+            print("      " + "\n      ".join(r.get("log_tail", [])))
+
+def main():
+    parser = argparse.ArgumentParser(description="3ILAB 파이프라인 벤치마크 (로컬 스텁)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--scenarios", default="fetch,render,db,history,history_cached,upload,daily")
+    parser.add_argument("--records", default="1000,10000,100000")
+    parser.add_argument("--daily-records", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--graph-delay", type=float, default=1.0)
+    parser.add_argument("--pages-delay", type=float, default=2.0)
+    parser.add_argument("--feeds", default="goldbox")
+    parser.add_argument("--coupang-quota", type=int)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out")
+    parser.add_argument("--compare")
+    parser.add_argument("--keep", action="store_true", help="작업 공간을 지우지 않음 (로그 확인용)")
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, int(args.records.split(",")[0]))
+        return
+
+    from benchmarks.stub_servers import CoupangStub, CdnStub, GraphStub, TelegramStub
+
+    scenarios = args.scenarios.split(",")
+    workspace = make_workspace()
+    stub_kwargs = {"latency": args.latency, "error_rate": args.error_rate, "seed": args.seed}
+    cdn = CdnStub(root=workspace, propagation_delay=args.pages_delay, **stub_kwargs).start()
+    coupang = CoupangStub(image_base=cdn.origin + "/product", quota_per_min=args.coupang_quota, **stub_kwargs).start()
+    graph = GraphStub(processing_delay=args.graph_delay, latency=args.latency, seed=args.seed).start()
+    telegram = TelegramStub(**stub_kwargs).start()
+    env = stub_env(workspace, coupang, cdn, graph, telegram)
+    env["COUPANG_FEEDS"] = args.feeds
+
+    print(f"🧪 작업 공간: {workspace}")
+    results = []
+    try:
+        # 뒤 항목이 쓰는 상품 목록/이미지를 만들기 위해 fetch, render 는 항상 먼저 실행
+        for scenario in ["fetch", "render"]:
+            result = run_worker(workspace, env, scenario)
+            if scenario in scenarios:
+                results.append(result)
+        if "db" in scenarios:
+            for count in args.records.split(","):
+                results.append(run_worker(workspace, env, "db", ["--records", count]))
+        for scenario in ("history", "history_cached"):
+            if scenario in scenarios:
+                for count in args.records.split(","):
+                    results.append(run_worker(workspace, env, scenario, ["--records", count]))
+        if "upload" in scenarios:
+            results.append(run_worker(workspace, env, "upload"))
+        if "daily" in scenarios:
+            results.append(run_worker(workspace, env, "daily", ["--records", str(args.daily_records)]))
+    finally:
+        calls = {"coupang": coupang.calls, "cdn": cdn.calls, "graph": graph.calls, "telegram": telegram.calls}
+        for stub in (cdn, coupang, graph, telegram):
+            stub.stop()
+        if not args.keep:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                            capture_output=True, text=True).stdout.strip()
+    output = {"commit": commit, "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+              "params": {k: v for k, v in vars(args).items() if k not in ("worker", "out", "compare", "keep")},
+              "stub_calls": calls, "results": results}
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    out = args.out or os.path.join(ROOT, ".cache", "bench", time.strftime("%Y%m%d_%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(output, f, ensure_ascii=False, indent=1)
+    print(f"📄 결과 저장: {out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+카드 렌더링 마이크로 벤치마크 (폰트/배경 캐시 전후 비교)
+
+    python benchmarks/bench_render.py [반복횟수]
+
+네트워크 없이 로컬 샘플 이미지로 카드 1장당 렌더링 + JPEG 인코딩 시간을 잽니다.
+"""
+import os
+import sys
+import time
+import glob
+from io import BytesIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # FONT_PATH 가 상대경로라서 루트에서 실행
+
+from src.make_image import CardRenderer
+
+def sample_image_bytes():
+    files = sorted(glob.glob("images/*/01.jpg"))
+    if files:
+        with open(files[-1], "rb") as f:
+            return f.read()
+    from PIL import Image
+    buf = BytesIO()
+    Image.new("RGB", (500, 500), "skyblue").save(buf, "JPEG")
+    return buf.getvalue()
+
+def bench(renderer, image_bytes, rounds):
+    item = {"id": "20990101-01", "rank": 1, "name": "벤치마크용 아주 긴 상품 이름 테스트 1박스 24개입", "price": 19300}
+    timings = {"cover": [], "product": [], "end": []}
+    for _ in range(rounds):
+        for kind in timings:
+            start = time.perf_counter()
+            if kind == "cover":
+                img = renderer.render_cover("20990101")
+            elif kind == "product":
+                img = renderer.render_product(item, image_bytes)
+            else:
+                img = renderer.render_end()
+            img.save(BytesIO(), "JPEG")
+            timings[kind].append(time.perf_counter() - start)
+    return {kind: sum(v) / len(v) * 1000 for kind, v in timings.items()}
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    image_bytes = sample_image_bytes()
+
+    before = bench(CardRenderer(cached=False), image_bytes, rounds)
+    after = bench(CardRenderer(cached=True), image_bytes, rounds)
+
+    print(f"카드 1장당 평균 (ms, {rounds}회)")
+    print(f"{'종류':<10}{'before':>10}{'after':>10}{'speedup':>10}")
+    for kind in before:
+        print(f"{kind:<10}{before[kind]:>10.2f}{after[kind]:>10.2f}{before[kind] / after[kind]:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
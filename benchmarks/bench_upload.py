@@ -0,0 +1,42 @@
+"""
+인스타그램 업로드 단계를 로컬 Graph API 스텁으로 실행해 시간을 잽니다.
+
+    python benchmarks/bench_upload.py [처리지연초] [응답지연초]
+
+실제 계정/네트워크 없이 컨테이너 생성 -> 상태 폴링 -> 게시 흐름을 확인할 수 있습니다.
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.stub_servers import GraphStub
+from src import config, upload_insta
+
+def sample_items(date_str="20990101"):
+    return [{"id": f"{date_str}-{rank:02d}", "date": date_str, "rank": rank,
+             "name": f"벤치마크 상품 {rank}", "price": 10000 + rank * 100}
+            for rank in range(1, 11)]
+
+def main():
+    processing_delay = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+
+    with GraphStub(processing_delay=processing_delay, latency=latency) as graph:
+        upload_insta.GRAPH_API_BASE = graph.base_url
+        # 키는 config 가 환경변수 우선으로 읽음 (secrets.json 의 실제 키 대신 스텁 값)
+        os.environ.update({"GH_ID": "stub", "GITHUB_ID": "stub",
+                           "INSTA_PAGE_ID": "1", "INSTA_ACCESS_TOKEN": "stub-token"})
+        config.reload()
+
+        start = time.perf_counter()
+        state = upload_insta.main(sample_items())
+        elapsed = time.perf_counter() - start
+
+    print(f"\n⏱️ 업로드 단계 {elapsed:.1f}초 (처리지연 {processing_delay}s, 응답지연 {latency}s)")
+    print(f"   - 게시물: {state.get('post_id')}, 호출: {graph.calls}")
+
+if __name__ == "__main__":
+    main()
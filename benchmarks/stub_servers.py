@@ -0,0 +1,291 @@
+"""
+외부 API 를 흉내 내는 로컬 스텁 서버들 (벤치마크/테스트용)
+
+각 스텁은 127.0.0.1 의 빈 포트에서 백그라운드 스레드로 뜹니다.
+    with GraphStub(processing_delay=3) as graph:
+        upload_insta.GRAPH_API_BASE = graph.base_url
+
+    CoupangStub   : 골드박스/베스트/검색/딥링크 API (COUPANG_API_BASE)
+    CdnStub       : 상품 이미지 + 깃허브 페이지   (상품 image_url, PAGES_BASE_URL)
+    GraphStub     : 인스타그램 Graph API         (GRAPH_API_BASE)
+    TelegramStub  : 텔레그램 sendMessage         (TELEGRAM_API_BASE)
+"""
+import json
+import os
+import random
+import threading
+import time
+import itertools
+import zlib
+from io import BytesIO
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+class StubServer:
+    """
+    latency: 응답마다 더할 지연(초), error_rate: 503 을 돌려줄 확률 (0~1)
+    하위 클래스는 handle(method, path, query, body) -> (status, dict 또는 bytes, headers) 구현
+    """
+    prefix = ""
+
+    def __init__(self, latency=0.0, error_rate=0.0, seed=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.calls = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    # ---- 서버 수명 ----
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _dispatch(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                parts = urlsplit(self.path)
+                path = parts.path[len(stub.prefix):] if parts.path.startswith(stub.prefix) else parts.path
+                query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                status, payload, headers = stub._respond(method, path, query, body, self.headers)
+                data = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                if not isinstance(payload, bytes):
+                    self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                if method != "HEAD":
+                    self.wfile.write(data)
+
+            def do_GET(self): self._dispatch("GET")
+            def do_POST(self): self._dispatch("POST")
+            def do_HEAD(self): self._dispatch("HEAD")
+            def log_message(self, *args): pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def origin(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    @property
+    def base_url(self):
+        return self.origin + self.prefix
+
+    # ---- 공통 처리 ----
+    def _respond(self, method, path, query, body, headers):
+        with self._lock:
+            key = f"{method} {self.route_name(path)}"
+            self.calls[key] = self.calls.get(key, 0) + 1
+            fail = self.random.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            return 503, {"error": "stub injected failure"}, None
+        return self.handle(method, path, query, body, headers)
+
+    def route_name(self, path):
+        return path
+
+    def handle(self, method, path, query, body, headers):
+        return 404, {"error": "not found"}, None
+
+class GraphStub(StubServer):
+    """
+    인스타그램 Graph API 흉내
+    - POST /{page}/media            : 이미지/캐러셀 컨테이너 생성 (processing_delay 초 뒤 FINISHED)
+    - GET  /{id}?fields=status_code : IN_PROGRESS / FINISHED
+    - POST /{page}/media_publish    : 캐러셀이 FINISHED 가 아니면 400
+    - GET  /me/accounts             : 토큰 확인
+    """
+    prefix = "/v19.0"
+
+    def __init__(self, processing_delay=2.0, **kwargs):
+        super().__init__(**kwargs)
+        self.processing_delay = processing_delay
+        self.containers = {}
+        self.published = []
+        self._ids = itertools.count(17000000000000001)
+
+    def route_name(self, path):
+        parts = path.strip("/").split("/")
+        if len(parts) == 2:
+            return "/{page}/" + parts[1] if parts[0] != "me" else path
+        return "/{id}" if parts[0].isdigit() else path
+
+    def _status(self, container_id):
+        ready_at = self.containers[container_id]["ready_at"]
+        return "FINISHED" if time.time() >= ready_at else "IN_PROGRESS"
+
+    def handle(self, method, path, query, body, headers):
+        form = {k: v[-1] for k, v in parse_qs(body.decode("utf-8")).items()}
+        parts = path.strip("/").split("/")
+
+        if method == "GET" and path == "/me/accounts":
+            return 200, {"data": [{"name": "stub page", "id": "1"}]}, None
+
+        if method == "POST" and len(parts) == 2 and parts[1] == "media":
+            container_id = str(next(self._ids))
+            with self._lock:
+                self.containers[container_id] = {
+                    "type": form.get("media_type", "IMAGE"),
+                    "children": form.get("children", ""),
+                    "ready_at": time.time() + self.processing_delay,
+                }
+            return 200, {"id": container_id}, None
+
+        if method == "POST" and len(parts) == 2 and parts[1] == "media_publish":
+            creation_id = form.get("creation_id")
+            if creation_id not in self.containers or self._status(creation_id) != "FINISHED":
+                return 400, {"error": {"message": "Media ID is not available", "code": 9007}}, None
+            with self._lock:
+                self.published.append(creation_id)
+            return 200, {"id": f"post_{creation_id}"}, None
+
+        if method == "GET" and len(parts) == 1 and parts[0] in self.containers:
+            return 200, {"id": parts[0], "status_code": self._status(parts[0])}, None
+
+        return 404, {"error": {"message": f"unknown path {path}"}}, None
+
+class CoupangStub(StubServer):
+    """
+    쿠팡 파트너스 API 흉내
+    - GET  .../products/goldbox?limit=N          : 상품 N개 (이미지는 image_base 아래 주소)
+    - GET  .../products/bestcategories/<id>      : 카테고리 베스트 (골드박스와 일부 겹침)
+    - GET  .../products/search?keyword=...       : {"productData": [...]} 형식
+    - POST .../deeplink                          : {"coupangUrls": [...]} -> 같은 순서의 shortenUrl
+    quota_per_min 을 주면 1분 창 안에서 그 수를 넘는 요청은 429 (Retry-After: 1)
+    """
+    API_PATH = "/v2/providers/affiliate_open_api/apis/openapi/v1"
+
+    def __init__(self, image_base="http://127.0.0.1:9/product", quota_per_min=None, **kwargs):
+        super().__init__(**kwargs)
+        self.image_base = image_base
+        self.quota_per_min = quota_per_min
+        self._recent = []
+
+    def route_name(self, path):
+        if "/bestcategories/" in path:
+            return "bestcategories"
+        return path.rsplit("/", 1)[-1]
+
+    def products(self, limit, offset=0):
+        return [{
+            "productName": f"스텁 상품 {rank} 대용량 특가 세트 {rank * 3}개입",
+            "productPrice": 9900 + rank * 1000,
+            "productUrl": f"https://www.coupang.com/vp/products/{7000000 + rank}?lptag=stub&itemId={rank}&vendorItemId={rank}",
+            "productImage": f"{self.image_base}/{rank}.jpg",
+        } for rank in range(offset + 1, offset + limit + 1)]
+
+    def _over_quota(self):
+        if not self.quota_per_min:
+            return False
+        now = time.time()
+        with self._lock:
+            self._recent = [t for t in self._recent if now - t < 60]
+            if len(self._recent) >= self.quota_per_min:
+                return True
+            self._recent.append(now)
+        return False
+
+    def handle(self, method, path, query, body, headers):
+        if not headers.get("Authorization", "").startswith("CEA "):
+            return 401, {"rCode": "401", "rMessage": "missing signature"}, None
+        if self._over_quota():
+            return 429, {"rCode": "429", "rMessage": "rate limit"}, {"Retry-After": "1"}
+        limit = int(query.get("limit", 10))
+        if method == "GET" and path == f"{self.API_PATH}/products/goldbox":
+            return 200, {"rCode": "0", "data": self.products(limit)}, None
+        if method == "GET" and path.startswith(f"{self.API_PATH}/products/bestcategories/"):
+            # 카테고리마다 조금씩 밀린 목록 -> 골드박스/다른 카테고리와 절반쯤 겹침
+            offset = int(path.rsplit("/", 1)[-1]) % 7
+            return 200, {"rCode": "0", "data": self.products(limit, offset)}, None
+        if method == "GET" and path == f"{self.API_PATH}/products/search":
+            offset = zlib.crc32(query.get("keyword", "").encode()) % 13
+            return 200, {"rCode": "0", "data": {"landingUrl": "https://link.coupang.com/a/stub",
+                                                "productData": self.products(limit, offset)}}, None
+        if method == "POST" and path == f"{self.API_PATH}/deeplink":
+            urls = json.loads(body or b"{}").get("coupangUrls", [])
+            data = [{"originalUrl": url, "shortenUrl": f"https://link.coupang.com/a/stub{zlib.crc32(url.encode())}"}
+                    for url in urls]
+            return 200, {"rCode": "0", "data": data}, None
+        return 404, {"rCode": "404"}, None
+
+class CdnStub(StubServer):
+    """
+    정적 파일 서버 흉내
+    - /product/<n>.jpg : 상품 원본 이미지 (번호별 색이 다른 size x size JPEG, 한 번 만들고 재사용)
+    - 그 밖의 경로      : root 폴더의 파일 (깃허브 페이지 역할)
+      처음 요청된 뒤 propagation_delay 초 동안은 404 -> 배포 반영 지연 흉내
+    """
+    def __init__(self, root=None, propagation_delay=0.0, size=500, **kwargs):
+        super().__init__(**kwargs)
+        self.root = root
+        self.propagation_delay = propagation_delay
+        self.size = size
+        self._images = {}
+        self._first_seen = {}
+
+    def route_name(self, path):
+        return "/product/{n}.jpg" if path.startswith("/product/") else "/static"
+
+    def product_image(self, name):
+        with self._lock:
+            if name not in self._images:
+                from PIL import Image
+                seed = sum(map(ord, name))
+                color = (seed * 37 % 256, seed * 91 % 256, seed * 53 % 256)
+                buf = BytesIO()
+                Image.new("RGB", (self.size, self.size), color).save(buf, "JPEG")
+                self._images[name] = buf.getvalue()
+            return self._images[name]
+
+    def handle(self, method, path, query, body, headers):
+        if path.startswith("/product/"):
+            return 200, self.product_image(path), {"Content-Type": "image/jpeg"}
+        if not self.root:
+            return 404, b"", None
+        file_path = os.path.join(self.root, path.lstrip("/"))
+        if not os.path.isfile(file_path):
+            return 404, b"", None
+        with self._lock:
+            first_seen = self._first_seen.setdefault(path, time.time())
+        if time.time() - first_seen < self.propagation_delay:
+            return 404, b"", None
+        with open(file_path, "rb") as f:
+            return 200, f.read(), {"Content-Type": "image/jpeg"}
+
+class TelegramStub(StubServer):
+    """텔레그램 Bot API 흉내 - POST /bot<token>/sendMessage 를 messages 에 모아둡니다."""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.messages = []
+
+    def route_name(self, path):
+        return "/bot{token}/" + path.rsplit("/", 1)[-1]
+
+    def handle(self, method, path, query, body, headers):
+        if method == "POST" and path.endswith("/sendMessage"):
+            form = {k: v[-1] for k, v in parse_qs(body.decode("utf-8")).items()}
+            with self._lock:
+                self.messages.append(form.get("text", ""))
+            return 200, {"ok": True, "result": {"message_id": len(self.messages)}}, None
+        return 404, {"ok": False}, None
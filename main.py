@@ -2,58 +2,33 @@ import sys
 import time
 import traceback
 import os
-import json
-import requests  # [추가] 웹 확인용
-from datetime import datetime, timedelta
+from datetime import datetime
 
-# 모듈 불러오기
-from src import fetch_data, make_image, update_db, telegram_bot, git_deploy, upload_insta, cleanup
+# 모듈 불러오기 (Pillow/requests 는 각 모듈이 실제로 쓸 때 import, 키는 config 가 처음 쓸 때 읽음)
+from src import config, fetch_data, price_history, make_image, optimize_image, update_db, telegram_bot, git_deploy, upload_insta, cleanup, http_client, pages_check, metrics, card_cache
+from src.pipeline import Pipeline, Stage, PipelineError
+from src.run_manifest import RunManifest, hash_images, today_kst
 
 # ============================================================================
 # [NEW] 웹 이미지 반영 확인 함수 (스마트 대기)
 # ============================================================================
-def wait_for_image_server(github_id, date_str, max_retries=20):
+def wait_for_image_server(github_id, items, deployed_at=None, timeout=600):
     """
-    깃허브 페이지에 이미지가 실제로 떴는지 30초마다 확인합니다.
-    최대 10분(30초 * 20회)까지 기다립니다.
+    인스타 업로드에 쓰일 이미지 URL 전부가 깃허브 페이지에 (로컬 파일과 같은 크기로)
+    떴는지 동시에 확인합니다. 최대 10분까지 기다립니다.
     """
-    # 확인해볼 샘플 이미지 (표지)
-    target_url = f"https://{github_id}.github.io/images/{date_str}/00_cover.jpg"
-    print(f"\n📡 [웹 반영 확인] 이미지 서버 응답 대기 중...")
-    print(f"   - 타겟 URL: {target_url}")
-
-    for i in range(max_retries):
-        try:
-            # 헤더만 살짝 찔러보기 (용량 아끼기 위해 head 요청)
-            response = requests.head(target_url)
-            
-            # 200 OK가 뜨면 이미지가 웹에 반영된 것임
-            if response.status_code == 200:
-                print(f"   ✅ [성공] 이미지가 웹에 노출되었습니다! (시도 {i+1}/{max_retries})")
-                return True
-            else:
-                print(f"   ⏳ [대기] 아직 반영 안 됨 (응답코드: {response.status_code})... 30초 뒤 재시도 ({i+1}/{max_retries})")
-        except Exception as e:
-            print(f"   ⚠️ 체크 중 에러: {e}")
-        
-        # 30초 휴식
-        time.sleep(30)
-    
-    print("❌ [실패] 10분이 지나도 이미지가 뜨지 않습니다.")
-    return False
+    date_str = items[0]['date']
+    targets = [(url, os.path.join("images", date_str, url.rsplit("/", 1)[-1]))
+               for url in upload_insta.build_image_urls(items, github_id)]
+    return pages_check.wait_until_live(targets, verify="size", timeout=timeout,
+                                       deployed_at=deployed_at) is not None
 
 # ============================================================================
 # 토큰 수명 체크 함수
 # ============================================================================
 def check_token_life():
     try:
-        secret_path = "secrets.json"
-        if not os.path.exists(secret_path): return
-
-        with open(secret_path, "r", encoding="utf-8") as f:
-            secrets = json.load(f)
-            
-        update_date_str = secrets.get("TOKEN_UPDATE_DATE")
+        update_date_str = config.get("TOKEN_UPDATE_DATE")
         if not update_date_str: return
 
         update_date = datetime.strptime(update_date_str, "%Y-%m-%d")
@@ -71,75 +46,189 @@ def check_token_life():
         print(f"⚠️ 토큰 날짜 체크 중 오류: {e}")
 
 # ============================================================================
-# 메인 실행 로직
+# 파이프라인 구성 (단계 + 의존 관계)
+#
+#   1.수집 ─┬─ 2.이미지 ─ 2-1.최적화 ─┐
+#           └─ 6.청소 ─ 3.DB ─────────┴─ 4.배포 ─ 4-1.웹반영확인 ─ 5.인스타
+#      (청소에서 지운 기록은 DB 화면 생성에, 지운 파일은 배포 커밋에 반영)
+#   7.토큰 체크 (독립)
+#
+# 끝난 단계는 .cache/runs/<날짜>.json 에 기록되고,
+# `python main.py --resume` 이면 기록된 단계는 건너뜁니다.
 # ============================================================================
-def run_daily_job():
-    step = "대기 중"
-    
-    try:
-        # secrets.json에서 ID 미리 읽기 (URL 체크용)
-        github_id = None
-        if os.path.exists("secrets.json"):
-            with open("secrets.json", "r", encoding="utf-8") as f:
-                github_id = json.load(f).get("GH_ID") # 이름 바꾼 GH_ID 사용
-        if not github_id: github_id = os.environ.get("GH_ID") # 액션 환경변수
-        
-        # 1. 데이터 수집
-        step = "1. 데이터 수집"
-        print(f"\n🚀 [{step}] 시작...")
+CHECKPOINT_STAGES = ["fetch", "cleanup", "render", "optimize", "db", "deploy", "wait", "upload"]
+# 작업 폴더에 결과를 쓰는 단계: 실행 기록(.cache)만 남고 작업 폴더는 새 체크아웃일 수 있으므로
+# 배포가 끝나기 전에는 건너뛰지 않고 다시 실행 (모두 다시 돌려도 결과가 같은 단계)
+WORKTREE_STAGES = {"cleanup", "optimize", "db"}
+
+def build_pipeline(github_id, run):
+    """run: {"manifest": RunManifest 또는 None} - 수집이 끝나야 날짜를 알 수 있어서 dict 로 전달"""
+    def fetch(_):
         items = fetch_data.get_goldbox_items(limit=10)
         if not items: raise Exception("수집된 상품이 0개입니다.")
+        # 지난 기록과 비교한 최저가 배지 (카드/본문/웹페이지에 사용, 실패해도 업로드는 진행)
+        try:
+            price_history.annotate(items)
+        except Exception as e:
+            print(f"⚠️ 가격 이력 분석 실패 (배지 없이 진행): {e}")
         print(f"✅ {len(items)}개 데이터 확보 완료")
+        return items
+
+    def render(up):
+        make_image.main(up["fetch"])
+
+    def optimize(up):
+        return optimize_image.main(up["fetch"])
+
+    def save_db(up):
+        update_db.save_to_json(up["fetch"], pruned_dates=(up["cleanup"] or {}).get("pruned_dates", []))
+
+    def deploy(up):
+        # 오늘 폴더/data/index.html + 청소 단계에서 지운 폴더만 커밋
+        result = git_deploy.push_to_github(up["fetch"][0]['date'], removed=(up["cleanup"] or {}).get("removed", []))
+        if not result["ok"]:
+            raise Exception(f"깃허브 배포(push)에 실패했습니다. ({result['error']})")
+        result["pushed_at"] = time.time()  # push 완료 시각 (반영 시간 측정용)
+        return result
 
-        # 2. 이미지 생성
-        step = "2. 이미지 생성"
-        print(f"\n🎨 [{step}] 시작...")
-        make_image.main(items)
-        print("✅ 이미지 생성 완료")
-
-        # 3. DB 업데이트
-        step = "3. DB 업데이트"
-        print(f"\n💾 [{step}] 시작...")
-        update_db.save_to_json(items)
-        print("✅ DB 저장 완료")
-
-        # 4. 깃허브 배포
-        step = "4. 깃허브 배포"
-        print(f"\n☁️ [{step}] 시작...")
-        git_deploy.push_to_github()
-        
-        # ------------------------------------------------------------------
+    def wait_pages(up):
+        items = up["fetch"]
         # [수정됨] 무작정 기다리는 대신, 실제로 떴는지 확인하는 '스마트 대기' 적용
-        # ------------------------------------------------------------------
         if github_id:
-            is_ready = wait_for_image_server(github_id, items[0]['date'])
-            if not is_ready:
+            deployed_at = (up["deploy"] or {}).get("pushed_at")
+            if not wait_for_image_server(github_id, items, deployed_at=deployed_at):
                 raise Exception("이미지가 깃허브 페이지에 반영되지 않았습니다. (시간 초과)")
         else:
             print("⚠️ GITHUB_ID를 찾을 수 없어 2분 강제 대기합니다.")
             time.sleep(120)
 
-        # 5. 인스타 업로드
-        step = "5. 인스타 업로드"
-        print(f"\n📸 [{step}] 시작...")
-        upload_insta.main(items)
+    def upload(up):
+        manifest = run["manifest"]
+        state = manifest.data.setdefault("instagram", {})
+        try:
+            upload_insta.main(up["fetch"], state)
+        finally:
+            manifest.save()  # 실패해도 만들어둔 컨테이너 ID 는 남김
 
-        # 6. 데이터 청소
-        step = "6. 데이터 청소"
-        cleanup.delete_old_folders(days=30)
+    def clean(_):
+        # 보존 정책: 원본 30일, 썸네일/상품 기록은 영구 보관 (RETAIN_*_DAYS 로 조절)
+        # 청소는 부가 작업이라 실패해도 오늘 DB/배포/업로드는 그대로 진행 (다음 실행 때 다시 정리)
+        try:
+            return cleanup.apply_retention()
+        except Exception as e:
+            print(f"⚠️ 데이터 정리 실패 (정리 없이 진행): {e}")
+            return {"removed": [], "pruned_dates": [], "error": str(e)}
 
-        # 7. 토큰/결과 알림
+    def token(_):
         check_token_life()
+
+    def on_stage_done(name, result):
+        if name == "fetch":
+            manifest = run["manifest"]
+            if manifest is None or manifest.date != result[0]['date']:
+                manifest = RunManifest(result[0]['date'])
+                manifest.reset()
+                run["manifest"] = manifest
+            manifest.mark_done("fetch", items=result)
+        elif name == "render":
+            run["manifest"].mark_done("render", images=hash_images(run["manifest"].date),
+                                      render=make_image.render_stamp(run["manifest"].data["items"]))
+        elif name == "cleanup":
+            run["manifest"].mark_done("cleanup", cleanup=result)
+        elif name == "deploy":
+            run["manifest"].mark_done("deploy", deploy={
+                "commit": result["commit"], "committed": result["committed"],
+                "pushed": result["pushed"], "elapsed": result["elapsed"]})
+        elif name in CHECKPOINT_STAGES:
+            run["manifest"].mark_done(name)
+
+    return Pipeline([
+        Stage("fetch", fetch, label="1. 데이터 수집", retries=1),
+        Stage("render", render, deps=["fetch"], label="2. 이미지 생성"),
+        Stage("optimize", optimize, deps=["fetch", "render"], label="2-1. 이미지 최적화"),
+        Stage("cleanup", clean, deps=["fetch"], label="6. 데이터 청소"),
+        Stage("db", save_db, deps=["fetch", "cleanup"], label="3. DB 업데이트"),
+        Stage("deploy", deploy, deps=["fetch", "optimize", "db", "cleanup"], label="4. 깃허브 배포", retries=1),
+        Stage("wait", wait_pages, deps=["fetch", "deploy"], label="4-1. 웹 반영 확인"),
+        Stage("upload", upload, deps=["fetch", "wait"], label="5. 인스타 업로드"),
+        Stage("token", token, label="7. 토큰 확인"),
+    ], on_stage_done=on_stage_done)
+
+def apply_checkpoint(pipeline, manifest):
+    """실행 기록에서 끝난 단계를 완료 처리합니다. (앞 단계가 모두 완료된 경우만)"""
+    for name in CHECKPOINT_STAGES:
+        stage = pipeline.stages[name]
+        if not manifest.is_done(name):
+            continue
+        if any(pipeline.records[dep]["status"] != "done" for dep in stage.deps):
+            continue
+        if name == "render" and not manifest.images_intact():
+            print("   ⚠️ 기록된 이미지와 실제 파일이 달라 이미지부터 다시 만듭니다.")
+            continue
+        if name in WORKTREE_STAGES and not manifest.is_done("deploy"):
+            print(f"   🔁 [{stage.label}] 아직 배포 전이라 결과물을 다시 만듭니다.")
+            continue
+        recorded = {"fetch": manifest.data["items"], "cleanup": manifest.data.get("cleanup", {})}
+        pipeline.mark_done(name, recorded.get(name))
+        print(f"   ⏭️ [{stage.label}] 이전 실행에서 완료됨 - 건너뜀")
+
+# ============================================================================
+# 메인 실행 로직
+# ============================================================================
+def save_run_report(pipeline, run, ok):
+    """날짜별 실행 보고서 저장 (.cache/reports/<날짜>.json, METRICS_TRACE=1 이면 크롬 트레이스도)"""
+    try:
+        date_str = run["manifest"].date if run.get("manifest") else today_kst()
+        stages = {name: {k: v for k, v in r.items() if k != "trace"} for name, r in pipeline.records.items()} if pipeline else {}
+        metrics.save_report(date_str, ok=ok, stages=stages, http=http_client.stats, card_cache=card_cache.stats)
+    except Exception as e:
+        print(f"⚠️ 실행 보고서 저장 실패: {e}")
+
+def run_daily_job(resume=False):
+    step = "대기 중"
+    pipeline = None
+    run = {"manifest": None}
+    
+    try:
+        # 깃허브 ID (URL 체크용): secrets.json 의 GH_ID, 없으면 환경변수 GH_ID / GITHUB_ID
+        github_id = config.github_id()
+
+        # 독립적인 단계는 동시에 실행됩니다 (예: 이미지 생성 ∥ DB 업데이트)
+        pipeline = build_pipeline(github_id, run)
+        if resume:
+            manifest = RunManifest(today_kst())
+            if manifest.is_done("fetch"):
+                print(f"\n♻️ [이어하기] {manifest.date} 실행 기록을 불러옵니다.")
+                run["manifest"] = manifest
+                apply_checkpoint(pipeline, manifest)
+            else:
+                print(f"\n♻️ [이어하기] {manifest.date} 실행 기록이 없어 처음부터 시작합니다.")
+        results = pipeline.run()
+        items = results["fetch"]
+
+        print(pipeline.timeline())
+        print(http_client.summary())
+        save_run_report(pipeline, run, ok=True)
+
+        # 결과 알림 (단계별 시간/주요 작업 요약 포함)
         success_msg = f"🎉 [작업 성공] 3ILAB 골드박스 업로드 완료!\n- {len(items)}개 상품 처리됨"
+        success_msg += "\n\n" + metrics.summary()
+        if sum(card_cache.stats.values()):
+            success_msg += "\n" + card_cache.summary()
         telegram_bot.send_message(success_msg) 
-        
         print("\n✨ 전체 작업 성공!")
 
     except Exception as e:
-        error_msg = f"🚨 [작업 실패]\n단계: {step}\n내용: {str(e)}\n\n{traceback.format_exc()[:200]}"
+        trace = traceback.format_exc()
+        if isinstance(e, PipelineError):
+            step, trace = e.stage.label, e.trace
+        if pipeline: print(pipeline.timeline())
+        save_run_report(pipeline, run, ok=False)
+        error_msg = f"🚨 [작업 실패]\n단계: {step}\n내용: {str(e)}\n\n{trace[:200]}"
         print(f"\n❌ {error_msg}")
         telegram_bot.send_message(error_msg)
         sys.exit(1)
 
 if __name__ == "__main__":
-    run_daily_job()
+    # python main.py --resume : 오늘 실행 기록을 보고 끝난 단계는 건너뜀
+    run_daily_job(resume="--resume" in sys.argv)
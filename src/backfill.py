@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from src import make_image, optimize_image, product_store, image_cache, card_cache, cleanup, metrics
+from src.run_manifest import RunManifest, hash_images
+
+# ============================================================================
+# 지난 날짜 카드 다시 만들기 (backfill)
+# - 저장된 상품 기록(data/)에서 날짜별 상품을 읽어 images/<날짜>/ 를 다시 렌더링합니다.
+# - 여러 날짜의 카드를 프로세스 풀 하나로 렌더링 (워커별 폰트/배경 캐시 재사용),
+#   원본 이미지는 디스크 캐시(image_cache)를 함께 씁니다.
+# - 실행 기록(.cache/runs/<날짜>.json)의 render 기록(디자인 버전 + 입력 해시)과 파일 해시가 맞는 날짜는 건너뜁니다.
+#
+#   python -m src.backfill                     : 원본 보존 기간(30일) 안의 날짜
+#   python -m src.backfill 20260101 20260131   : 기간 지정 (시작, 끝 포함)
+#   python -m src.backfill --all               : 기록이 있는 모든 날짜
+#   --force : 최신이어도 다시 렌더링,  --dry-run : 대상만 출력
+# ============================================================================
+CHUNK_DAYS = int(os.environ.get("BACKFILL_CHUNK_DAYS", "20"))   # 한 번에 다운로드/렌더링할 날짜 수
+
+def items_by_date(start=None, end=None):
+    """{날짜: 순위순 상품 목록} (start~end 포함, 없으면 전체)"""
+    days = {}
+    for item in product_store.load_all():
+        date_str = item.get('date')
+        if not date_str or (start and date_str < start) or (end and date_str > end):
+            continue
+        days.setdefault(date_str, []).append(item)
+    return {date_str: sorted(items, key=lambda item: item['rank']) for date_str, items in sorted(days.items())}
+
+def is_up_to_date(date_str, items):
+    manifest = RunManifest(date_str)
+    return (manifest.data.get("render") == make_image.render_stamp(items)
+            and manifest.images_intact())
+
+def _finish_day(date_str, items, results):
+    """날짜 하나가 끝나면 실행 기록(render 도장)을 갱신합니다. 반환: 성공한 카드 수"""
+    failed = [name for name, (size, _) in results.items() if size == 0]
+    if failed:
+        # 원본 이미지를 못 받은 카드가 있으면 도장을 찍지 않아서 다음 backfill 때 다시 시도
+        print(f"   ⚠️ {date_str}: {len(failed)}장 실패 (기존 파일 유지)")
+        return len(results) - len(failed)
+    manifest = RunManifest(date_str)
+    manifest.mark_done("render", items=manifest.data.get("items") or items,
+                       images=hash_images(date_str), render=make_image.render_stamp(items))
+    return len(results)
+
+def run(start=None, end=None, force=False, dry_run=False, workers=None):
+    days = items_by_date(start, end)
+    todo = {d: items for d, items in days.items() if force or not is_up_to_date(d, items)}
+    print(f"\n🔁 [Backfill] 기록 {len(days)}일 중 {len(todo)}일 렌더링 (최신 {len(days) - len(todo)}일 건너뜀)")
+    if dry_run or not todo:
+        for date_str, items in todo.items():
+            print(f"   - {date_str}: {len(items)}개 상품")
+        return {"days": len(todo), "cards": 0, "elapsed": 0.0}
+
+    workers = workers or make_image.RENDER_WORKERS
+    start_time = time.perf_counter()
+    cards = 0
+    dates = list(todo)
+    with make_image.process_pool(workers) as pool:
+        for offset in range(0, len(dates), CHUNK_DAYS):
+            chunk = dates[offset:offset + CHUNK_DAYS]
+            jobs, chunk_items = [], []
+            for date_str in chunk:
+                save_dir = f"images/{date_str}"
+                os.makedirs(save_dir, exist_ok=True)
+                jobs += make_image.build_jobs(todo[date_str], save_dir, prefix=f"{date_str}/")
+                chunk_items += todo[date_str]
+
+            results = make_image.render_jobs(jobs, chunk_items, workers=workers, pool=pool)
+            # 썸네일도 같은 프로세스 풀에서 날짜별로 동시에
+            for future in [pool.submit(optimize_image.make_thumbnails, date_str) for date_str in chunk]:
+                future.result()
+            for date_str in chunk:
+                day_results = {name: r for name, r in results.items() if name.startswith(date_str + "/")}
+                cards += _finish_day(date_str, todo[date_str], day_results)
+
+            elapsed = time.perf_counter() - start_time
+            done = min(offset + CHUNK_DAYS, len(dates))
+            print(f"   ⏳ {done}/{len(dates)}일 ({chunk[-1]}) | 카드 {cards}장, {cards / elapsed:.1f}장/초")
+
+    elapsed = time.perf_counter() - start_time
+    metrics.count("backfill.cards", cards)
+    print(f"📊 [Backfill 완료] {len(dates)}일, 카드 {cards}장 | ⏱️ {elapsed:.1f}초 ({cards / elapsed:.1f}장/초, 워커 {workers}개)")
+    print(image_cache.summary())
+    print(card_cache.summary())
+    card_cache.evict()
+    return {"days": len(dates), "cards": cards, "elapsed": round(elapsed, 3)}
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    flags = set(a for a in sys.argv[1:] if a.startswith("--"))
+    if "--all" in flags:
+        start = end = None
+    elif args:
+        start, end = args[0], args[1] if len(args) > 1 else args[0]
+    else:
+        # 원본 이미지 보존 기간 안의 날짜만 (그 이전은 cleanup 이 원본을 지움)
+        start = (datetime.now() - timedelta(days=cleanup.POLICIES["images"] or 3650)).strftime("%Y%m%d")
+        end = None
+    run(start, end, force="--force" in flags, dry_run="--dry-run" in flags)
@@ -0,0 +1,108 @@
+import os
+import shutil
+import hashlib
+import threading
+
+# ============================================================================
+# 렌더링 결과 캐시 (내용 해시 기반)
+# - card  : 완성된 카드 JPEG. 입력(디자인 버전, 원본 이미지 bytes, 상품명, 가격, 순위, 번호)이
+#           같으면 다시 그리지 않고 복사 -> 같은 bytes 라 git 도 새 파일을 저장하지 않음
+# - layer : 상품 레이어(원본 사진 + 상품명 + 가격) PNG. 순위/번호만 바뀐 날에는
+#           이 레이어 위에 순위/번호만 다시 그립니다.
+# - .cache/cards 아래 저장, 용량 초과 시 오래 안 쓴 파일부터 삭제 (LRU, mtime 기준)
+# - 프로세스 풀 워커들이 같이 쓰므로 임시파일에 쓰고 os.replace 로 교체
+# ============================================================================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.environ.get("CARD_CACHE_DIR", os.path.join(BASE_DIR, ".cache", "cards"))
+MAX_CACHE_BYTES = int(os.environ.get("CARD_CACHE_MAX_MB", "200")) * 1024 * 1024
+ENABLED = os.environ.get("CARD_CACHE", "1") != "0"
+
+_lock = threading.Lock()
+stats = {"card": 0, "layer": 0, "miss": 0}
+
+def key(*parts):
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+def _path(cache_key, ext):
+    return os.path.join(CACHE_DIR, f"{cache_key}.{ext}")
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+def _replace(write, path):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+def restore_card(cache_key, save_path):
+    """같은 카드가 캐시에 있으면 save_path 로 복사하고 크기를, 없으면 None"""
+    path = _path(cache_key, "jpg")
+    if not ENABLED or not os.path.exists(path):
+        return None
+    _touch(path)
+    shutil.copyfile(path, save_path)
+    return os.path.getsize(save_path)
+
+def store_card(cache_key, save_path):
+    if ENABLED:
+        _replace(lambda tmp: shutil.copyfile(save_path, tmp), _path(cache_key, "jpg"))
+
+def load_layer(cache_key):
+    """상품 레이어 Image (없으면 None)"""
+    path = _path(cache_key, "png")
+    if not ENABLED or not os.path.exists(path):
+        return None
+    from PIL import Image
+    _touch(path)
+    with Image.open(path) as img:
+        return img.convert("RGB")
+
+def store_layer(cache_key, img):
+    # 무손실(PNG)로 저장해야 캐시를 거쳐도 결과 JPEG 가 똑같음. 속도 위해 압축은 약하게
+    if ENABLED:
+        _replace(lambda tmp: img.save(tmp, "PNG", compress_level=1), _path(cache_key, "png"))
+
+def record(status):
+    """부모 프로세스에서 카드별 캐시 결과(card/layer/miss)를 집계"""
+    if status in stats:
+        with _lock:
+            stats[status] += 1
+
+def evict(max_bytes=None):
+    """용량 초과분을 오래 안 쓴 순서대로 삭제합니다."""
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    try:
+        entries = [e for e in os.scandir(CACHE_DIR) if e.name.endswith((".jpg", ".png"))]
+    except FileNotFoundError:
+        return 0
+    files = []
+    for entry in entries:
+        try:
+            st = entry.stat()
+        except FileNotFoundError:
+            continue
+        files.append((st.st_mtime, st.st_size, entry.path))
+    total = sum(size for _, size, _ in files)
+    removed = 0
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+def summary():
+    total = sum(stats.values())
+    if not total:
+        return "🧩 [카드 캐시] 사용 안 함" if not ENABLED else "🧩 [카드 캐시] 렌더링 없음"
+    reused = stats["card"] + stats["layer"]
+    return (f"🧩 [카드 캐시] 카드 재사용 {stats['card']}장 / 레이어 재사용 {stats['layer']}장 / "
+            f"새로 그림 {stats['miss']}장 (적중률 {reused / total * 100:.0f}%)")
@@ -1,49 +1,200 @@
 import os
-import shutil
+import sys
 from datetime import datetime, timedelta
 
-def delete_old_folders(days=30):
-    print(f"\n🧹 [데이터 정리] {days}일 지난 이미지 삭제 시작...")
-    
-    # images 폴더 경로
-    base_dir = "images"
-    if not os.path.exists(base_dir):
-        print("   - images 폴더가 없어서 넘어갑니다.")
-        return
-
-    # 기준 날짜 계산 (오늘 - 30일)
-    cutoff_date = datetime.now() - timedelta(days=days)
-    cutoff_str = cutoff_date.strftime("%Y%m%d")
-    print(f"   - 삭제 기준일: {cutoff_str} 이전 데이터")
-
-    deleted_count = 0
-
-    # 폴더 하나씩 검사
-    for folder_name in os.listdir(base_dir):
-        folder_path = os.path.join(base_dir, folder_name)
-        
-        # 폴더인지 확인
-        if not os.path.isdir(folder_path):
+from src import product_store
+
+# ============================================================================
+# 보존 정책 (retention)
+# - 산출물 종류별로 보관 기간(일)을 따로 둡니다. 0 이면 영구 보관.
+#     images  : images/<날짜>/*.jpg          인스타용 1080px 원본 (저장소 용량의 대부분)
+#     thumbs  : images/<날짜>/thumb/          사이트 지난 날짜 카드용 썸네일
+#     records : data/ 상품 기록 (+ SQLite)    지난 날짜/검색 목록
+# - 원본을 지울 날짜에 썸네일이 없으면 먼저 만들어서 사이트 카드가 Expired 가 되지 않게 합니다.
+# - 기본값: 원본만 30일 뒤 정리, 썸네일과 상품 기록은 영구 보관 (역대 최저가 비교에도 필요)
+#   기록/썸네일 정리는 RETAIN_RECORDS_DAYS / RETAIN_THUMBS_DAYS 를 지정했을 때만
+#   (둘을 같은 기간으로 두면 사이트에 이미지 없는 카드가 남지 않음)
+# - 지운 경로 목록을 돌려주면 git_deploy 가 같은 커밋에 삭제를 담습니다.
+# ============================================================================
+IMAGES_DIR = "images"
+POLICIES = {
+    "images": int(os.environ.get("RETAIN_IMAGES_DAYS", "30")),
+    "thumbs": int(os.environ.get("RETAIN_THUMBS_DAYS", "0")),
+    "records": int(os.environ.get("RETAIN_RECORDS_DAYS", "0")),
+}
+DELETE_BATCH = 500      # 한 번에 지우는 파일 수 (진행 상황 출력 단위)
+
+def _cutoff(days, today):
+    if not days:
+        return None
+    return (today - timedelta(days=days)).strftime("%Y%m%d")
+
+def image_cutoff(today):
+    """이 날짜보다 이전 폴더는 원본 JPEG 가 지워졌음 (썸네일만 남음). 영구 보관이면 None"""
+    return _cutoff(POLICIES["images"], today)
+
+def _scan_files(path):
+    """폴더 아래 파일 (경로, 크기) 목록 - os.scandir 로 재귀"""
+    files = []
+    for entry in os.scandir(path):
+        if entry.is_dir(follow_symlinks=False):
+            files += _scan_files(entry.path)
+        else:
+            files.append((entry.path, entry.stat(follow_symlinks=False).st_size))
+    return files
+
+def _date_folders(base_dir):
+    if not os.path.isdir(base_dir):
+        return []
+    return sorted((entry for entry in os.scandir(base_dir)
+                  if entry.is_dir() and len(entry.name) == 8 and entry.name.isdigit()), key=lambda e: e.name)
+
+def plan(policies=None, today=None, base_dir=IMAGES_DIR):
+    """
+    지울 대상을 계산합니다. (아무것도 지우지 않음)
+    반환: {"files": [(경로, 크기)], "dirs": [비워지면 지울 폴더], "thumbs_needed": [날짜],
+           "removed": [git 에 알릴 경로], "records_before": 날짜 또는 None}
+    """
+    policies = dict(POLICIES, **(policies or {}))
+    today = today or datetime.now()
+    image_cutoff = _cutoff(policies["images"], today)
+    thumb_cutoff = _cutoff(policies["thumbs"], today)
+
+    result = {"files": [], "dirs": [], "thumbs_needed": [], "removed": [],
+              "records_before": _cutoff(policies["records"], today)}
+    for folder in _date_folders(base_dir):
+        date_str = folder.name
+        drop_images = image_cutoff and date_str < image_cutoff
+        drop_thumbs = thumb_cutoff and date_str < thumb_cutoff
+        if not drop_images and not drop_thumbs:
+            continue
+
+        files = _scan_files(folder.path)
+        thumb_prefix = os.path.join(folder.path, "thumb") + os.sep
+        thumbs = [f for f in files if f[0].startswith(thumb_prefix)]
+        originals = [f for f in files if not f[0].startswith(thumb_prefix)]
+
+        # 썸네일이 있어도 빠진 크기(예: 나중에 추가된 640w)가 있을 수 있으니 원본이 남아 있으면 항상 확인
+        # (make_thumbnails 는 이미 최신인 썸네일은 건너뜀)
+        if drop_images and not drop_thumbs and originals:
+            result["thumbs_needed"].append(date_str)
+
+        # 원본과 썸네일을 모두 지우면 폴더째, 아니면 해당 파일만
+        targets = (originals if drop_images else []) + (thumbs if drop_thumbs else [])
+        if not targets:
             continue
+        result["files"] += targets
+        if drop_thumbs:
+            result["dirs"].append(os.path.join(folder.path, "thumb"))
+        if drop_images and drop_thumbs:
+            result["dirs"].append(folder.path)
+        result["removed"].append(f"{base_dir}/{date_str}")
+    return result
 
-        # 폴더 이름(20251208)이 날짜 형식이 맞는지 확인
-        try:
-            # 폴더명이 날짜(8자리 숫자)인지 체크
-            if len(folder_name) == 8 and folder_name.isdigit():
-                # 날짜 비교 (문자열 비교로도 충분함: "20240101" < "20240201")
-                if folder_name < cutoff_str:
-                    print(f"   🗑️ 삭제 중: {folder_name} (오래된 데이터)")
-                    shutil.rmtree(folder_path) # 폴더 통째로 삭제
-                    deleted_count += 1
-        except Exception as e:
-            print(f"   ⚠️ 에러 발생 ({folder_name}): {e}")
-
-    if deleted_count == 0:
-        print("   ✨ 삭제할 오래된 폴더가 없습니다.")
+def _delete_files(files, dry_run=False, errors=None):
+    """파일을 DELETE_BATCH 개씩 지웁니다. 지우지 못한 파일은 errors 에 남기고 계속. 반환: (지운 파일 수, 바이트)"""
+    count = size = 0
+    for start in range(0, len(files), DELETE_BATCH):
+        batch = files[start:start + DELETE_BATCH]
+        for path, file_size in batch:
+            if not dry_run:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    print(f"   ⚠️ 삭제 실패 {path}: {e}")
+                    if errors is not None:
+                        errors.append((path, str(e)))
+                    continue
+            count += 1
+            size += file_size
+        if len(files) > DELETE_BATCH:
+            print(f"   🗑️ {min(start + DELETE_BATCH, len(files))}/{len(files)}개 처리")
+    return count, size
+
+def _prune_records(before_date, dry_run=False):
+    """상품 기록(JSON + SQLite) 정리. 반환: (지운 날짜 목록, 지운 상품 수, 경로 목록)"""
+    from src import update_db, sqlite_store
+
+    dates, count, paths = product_store.prune(before_date, dry_run=dry_run)
+    if update_db.USE_SQLITE and not dry_run and os.path.exists(sqlite_store.DB_FILE):
+        sqlite_store.delete_before(before_date)
+    base = product_store.BASE_DIR
+    return dates, count, [os.path.relpath(p, base).replace(os.sep, "/") for p in paths]
+
+def _keep_date(target, date_str, base_dir):
+    """썸네일을 못 만든 날짜는 원본을 지우지 않습니다. (사이트 카드가 Expired 가 되지 않게)"""
+    folder = os.path.join(base_dir, date_str) + os.sep
+    target["files"] = [f for f in target["files"] if not f[0].startswith(folder)]
+    target["dirs"] = [d for d in target["dirs"] if not (d + os.sep).startswith(folder)]
+    target["removed"] = [p for p in target["removed"] if p != f"{base_dir}/{date_str}"]
+
+def apply_retention(policies=None, dry_run=False, today=None, base_dir=IMAGES_DIR):
+    """
+    보존 정책을 적용합니다.
+    반환: {"removed": [git 스테이징할 경로], "pruned_dates": [기록을 지운 날짜],
+           "files": 지운 파일 수, "bytes": 확보한 용량, "records": 지운 상품 수, "dry_run",
+           "errors": [(날짜 또는 경로, 오류)] - 실패한 날짜/파일은 건너뛰고 나머지는 계속}
+    """
+    policies = dict(POLICIES, **(policies or {}))
+    label = " [DRY-RUN]" if dry_run else ""
+    days = lambda n: f"{n}일" if n else "영구"
+    print(f"\n🧹 [데이터 정리]{label} 보존 기간 - 원본 {days(policies['images'])}, "
+          f"썸네일 {days(policies['thumbs'])}, 기록 {days(policies['records'])}")
+
+    target = plan(policies, today, base_dir)
+    errors = []
+
+    # 원본만 지우는 날짜는 썸네일부터 확보
+    if target["thumbs_needed"]:
+        print(f"   🖼️ 원본 삭제 전 썸네일 생성: {len(target['thumbs_needed'])}개 날짜")
+        if not dry_run:
+            from src import optimize_image
+            for date_str in target["thumbs_needed"]:
+                try:
+                    report = optimize_image.make_thumbnails(date_str, base_dir=base_dir)
+                    failed = report["errors"]
+                except Exception as e:
+                    failed = [("*", str(e))]
+                if failed:
+                    print(f"   ⚠️ {date_str}: 썸네일 {len(failed)}장 실패 -> 원본을 남겨둡니다.")
+                    errors += [(f"{date_str}/{name}", error) for name, error in failed]
+                    _keep_date(target, date_str, base_dir)
+
+    files, size = _delete_files(target["files"], dry_run, errors)
+    if not dry_run:
+        for path in target["dirs"]:
+            try:
+                os.rmdir(path)
+            except OSError:
+                pass  # 이미 없거나 다른 파일이 남아있음
+
+    result = {"removed": list(target["removed"]), "pruned_dates": [], "files": files,
+              "bytes": size, "records": 0, "dry_run": dry_run, "errors": errors}
+    if target["records_before"]:
+        dates, count, paths = _prune_records(target["records_before"], dry_run)
+        result["pruned_dates"], result["records"] = dates, count
+        result["removed"] += paths
+
+    if dry_run:
+        for path in result["removed"]:
+            print(f"      - {path}")
+    if not files and not result["records"]:
+        print("   ✨ 보존 기간이 지난 데이터가 없습니다.")
     else:
-        print(f"   ✅ 총 {deleted_count}개의 오래된 폴더를 삭제했습니다.")
+        verb = "삭제 예정" if dry_run else "삭제"
+        print(f"   ✅ 이미지 폴더 {len(target['removed'])}개, 파일 {files}개 {verb} "
+              f"({size / (1024 * 1024):.1f} MB 확보) | 상품 기록 {result['records']}개"
+              f" ({len(result['pruned_dates'])}일치) {verb}")
+    if errors:
+        print(f"   ⚠️ 정리 중 실패 {len(errors)}건 (다음 실행 때 다시 시도)")
+    return result
+
+def delete_old_folders(days=30):
+    """예전 방식 호환: days 일 지난 이미지 폴더를 통째로 삭제 (지운 경로 목록 반환)"""
+    return apply_retention({"images": days, "thumbs": days, "records": 0})["removed"]
 
-# 테스트용
+# python -m src.cleanup [--dry-run]
 if __name__ == "__main__":
-    # 테스트 할 때는 0일(오늘 이전 전부)로 설정해서 잘 지워지나 확인 가능
-    delete_old_folders(days=30)
+    apply_retention(dry_run="--dry-run" in sys.argv)
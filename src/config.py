@@ -0,0 +1,58 @@
+import json
+import os
+import threading
+
+# ============================================================================
+# 설정/비밀값 (한 곳에서 한 번만 읽기)
+# - secrets.json 은 처음 필요할 때 한 번만 읽어서 기억합니다. (모듈 import 때는 읽지 않음)
+# - 같은 이름의 환경변수가 있으면 환경변수가 우선 (GitHub Actions secrets, 벤치마크 스텁)
+# - 키가 없어도 모듈 import 는 되고, 실제로 그 키를 쓰는 순간에만 에러가 납니다.
+#
+#   config.get("TELEGRAM_BOT_TOKEN")                        : 없으면 None
+#   config.require("COUPANG_ACCESS_KEY", "COUPANG_SECRET_KEY") : 없으면 ValueError
+# ============================================================================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SECRETS_FILE = os.environ.get("SECRETS_FILE", os.path.join(BASE_DIR, "secrets.json"))
+
+_lock = threading.Lock()
+_secrets = None
+
+def load_secrets():
+    """secrets.json 내용 (없거나 깨졌으면 빈 dict). 한 번 읽으면 reload() 전까지 재사용"""
+    global _secrets
+    with _lock:
+        if _secrets is None:
+            data = {}
+            if os.path.exists(SECRETS_FILE):
+                try:
+                    with open(SECRETS_FILE, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ secrets.json 읽기 실패 ({e}), 환경변수만 사용합니다.")
+            _secrets = data
+        return _secrets
+
+def reload():
+    """다음 get() 때 secrets.json 을 다시 읽습니다. (토큰 갱신 후 등)"""
+    global _secrets
+    with _lock:
+        _secrets = None
+
+def get(name, default=None):
+    value = os.environ.get(name)
+    if value:
+        return value
+    value = load_secrets().get(name)
+    return value if value not in (None, "") else default
+
+def require(*names):
+    """여러 키를 한 번에 (하나라도 없으면 ValueError) -> 값 tuple"""
+    values = tuple(get(name) for name in names)
+    missing = [name for name, value in zip(names, values) if not value]
+    if missing:
+        raise ValueError(f"❌ 설정값이 없습니다: {', '.join(missing)} (secrets.json 또는 환경변수)")
+    return values
+
+def github_id():
+    # secrets.json 은 GH_ID (예전 이름 GITHUB_ID), 액션 환경변수도 GH_ID
+    return get("GH_ID") or get("GITHUB_ID")
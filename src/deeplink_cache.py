@@ -0,0 +1,80 @@
+import json
+import os
+import time
+from datetime import datetime
+
+# ============================================================================
+# 딥링크 캐시 (세탁된 상품 URL -> 쿠팡 단축 링크)
+# - .cache/deeplinks.json 에 저장 (Actions 에서는 actions/cache 로 복원)
+# - 캐시 파일이 없으면 상품 기록(product_url 이 있는 항목)에서 다시 채웁니다
+# - TTL 이 지난 항목은 버리고, 개수가 넘치면 오래 안 쓴 것부터 삭제
+# ============================================================================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_FILE = os.environ.get("DEEPLINK_CACHE_FILE", os.path.join(BASE_DIR, ".cache", "deeplinks.json"))
+TTL_DAYS = int(os.environ.get("DEEPLINK_CACHE_TTL_DAYS", "30"))
+MAX_ENTRIES = int(os.environ.get("DEEPLINK_CACHE_MAX", "5000"))
+
+_entries = None
+stats = {"hit": 0, "miss": 0}
+
+def _seed_from_history():
+    """기존 상품 기록에서 url -> 딥링크 쌍을 모읍니다. (최신 기록 우선)"""
+    from src import product_store
+
+    entries = {}
+    for item in product_store.load_all():
+        url, link = item.get('product_url'), item.get('link')
+        if not url or not link or link == url or url in entries:
+            continue
+        ts = datetime.strptime(item['date'], "%Y%m%d").timestamp()
+        entries[url] = {"link": link, "created": ts, "used": ts}
+    if entries:
+        print(f">> 🔗 딥링크 캐시를 기록에서 {len(entries)}개 복원했습니다.")
+    return entries
+
+def _load():
+    global _entries
+    if _entries is None:
+        try:
+            with open(CACHE_FILE, "r", encoding="utf-8") as f:
+                _entries = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            _entries = _seed_from_history()
+    return _entries
+
+def get(url):
+    entries = _load()
+    entry = entries.get(url)
+    if entry and time.time() - entry["created"] < TTL_DAYS * 86400:
+        entry["used"] = time.time()
+        stats["hit"] += 1
+        return entry["link"]
+    stats["miss"] += 1
+    return None
+
+def put(url, link):
+    if not link or link == url:  # 실패해서 원본이 돌아온 경우는 저장 안 함
+        return
+    now = time.time()
+    _load()[url] = {"link": link, "created": now, "used": now}
+
+def save():
+    entries = _load()
+    now = time.time()
+    alive = {url: e for url, e in entries.items() if now - e["created"] < TTL_DAYS * 86400}
+    if len(alive) > MAX_ENTRIES:
+        newest = sorted(alive.items(), key=lambda kv: kv[1]["used"], reverse=True)[:MAX_ENTRIES]
+        alive = dict(newest)
+    entries.clear()
+    entries.update(alive)
+
+    os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+    tmp_path = CACHE_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, ensure_ascii=False)
+    os.replace(tmp_path, CACHE_FILE)
+
+def summary():
+    total = stats["hit"] + stats["miss"]
+    rate = (stats["hit"] / total * 100) if total else 0.0
+    return f"🔗 딥링크 캐시 적중 {stats['hit']}/{total} ({rate:.0f}%)"
@@ -1,33 +1,22 @@
-import requests
-import json
 import hmac
 import hashlib
 import os
 from time import gmtime, strftime
 from datetime import datetime, timedelta # [수정] timedelta 추가
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 
-# 1. API KEY 로드
+from src import config, deeplink_cache, http_client, metrics, rate_limit
+
+# 쿠팡 API 주소 (로컬 스텁으로 테스트할 때 COUPANG_API_BASE 로 바꿀 수 있음)
+COUPANG_API_BASE = os.environ.get("COUPANG_API_BASE", "https://api-gateway.coupang.com")
+# 쿠팡 API 호출 속도 제한 (모든 호출 공용, COUPANG_RATE_PER_MIN / COUPANG_BURST 로 조절)
+rate_limiter = rate_limit.from_env("COUPANG", per_minute=50, burst=10)
+
+# 1. API KEY 로드 (import 때가 아니라 첫 API 호출 때 config 에서 읽음)
 def load_api_keys():
-    access_key = None
-    secret_key = None
-    secret_file_path = "secrets.json"
-    if os.path.exists(secret_file_path):
-        try:
-            with open(secret_file_path, "r", encoding="utf-8") as f:
-                secrets = json.load(f)
-                access_key = secrets.get("COUPANG_ACCESS_KEY")
-                secret_key = secrets.get("COUPANG_SECRET_KEY")
-        except Exception: pass
-
-    if not access_key: access_key = os.environ.get("COUPANG_ACCESS_KEY")
-    if not secret_key: secret_key = os.environ.get("COUPANG_SECRET_KEY")
-
-    if not access_key or not secret_key:
-        raise ValueError("❌ API Key가 없습니다!")
-    return access_key, secret_key
-
-ACCESS_KEY, SECRET_KEY = load_api_keys()
+    """(access_key, secret_key) - 없으면 ValueError"""
+    return config.require("COUPANG_ACCESS_KEY", "COUPANG_SECRET_KEY")
 
 # 2. 인증 헤더 생성
 def generate_hmac(method, url, secret_key, access_key):
@@ -38,22 +27,24 @@ def generate_hmac(method, url, secret_key, access_key):
     return "CEA algorithm=HmacSHA256, access-key={}, signed-date={}, signature={}".format(access_key, datetime_gmt, signature)
 
 def call_api(method, path, params=None, data=None):
-    DOMAIN = "https://api-gateway.coupang.com"
     if params:
         query = urllib.parse.urlencode(params)
         path_with_query = f"{path}?{query}"
     else:
         path_with_query = path
-    full_url = f"{DOMAIN}{path_with_query}"
+    full_url = f"{COUPANG_API_BASE}{path_with_query}"
 
-    authorization = generate_hmac(method, path_with_query, SECRET_KEY, ACCESS_KEY)
+    access_key, secret_key = load_api_keys()
+    authorization = generate_hmac(method, path_with_query, secret_key, access_key)
     headers = {"Authorization": authorization, "Content-Type": "application/json;charset=UTF-8"}
 
+    rate_limiter.acquire()
     try:
-        if method == "GET": response = requests.get(full_url, headers=headers)
-        elif method == "POST": response = requests.post(full_url, headers=headers, json=data)
-        response.raise_for_status()
-        return response.json()
+        with metrics.span("coupang.call_api", method=method, path=path):
+            if method == "GET": response = http_client.get(full_url, headers=headers)
+            elif method == "POST": response = http_client.post(full_url, headers=headers, json=data)
+            response.raise_for_status()
+            return response.json()
     except Exception as e:
         print(f"❌ API 호출 에러 ({path}): {e}")
         return None
@@ -69,17 +60,135 @@ def clean_coupang_url(url):
 # ============================================================================
 # 딥링크 생성
 # ============================================================================
+DEEPLINK_PATH = "/v2/providers/affiliate_open_api/apis/openapi/v1/deeplink"
+DEEPLINK_BATCH_SIZE = 20  # 한 번 요청에 보낼 URL 수
+
+def make_deep_links(origin_urls):
+    """
+    여러 URL 을 한 번(또는 몇 번)의 요청으로 딥링크로 바꿉니다.
+    반환: {원본 URL: 딥링크}
+    성공한 묶음 응답에서 빠진 URL 만 한 개씩 다시 요청합니다.
+    묶음 요청 자체가 실패하면 (장애/재시도 소진) 개별 요청으로 호출 수를 늘리지 않고 원본 URL 을 그대로 씁니다.
+    """
+    unique_urls = list(dict.fromkeys(origin_urls))
+    links = {}
+    missing = []
+
+    for start in range(0, len(unique_urls), DEEPLINK_BATCH_SIZE):
+        batch = unique_urls[start:start + DEEPLINK_BATCH_SIZE]
+        res = call_api("POST", DEEPLINK_PATH, data={"coupangUrls": batch})
+        if not (res and res.get('rCode') == '0' and res.get('data')):
+            print(f">> ⚠️ 딥링크 묶음 요청 실패, {len(batch)}개는 원본 URL 사용")
+            metrics.count("deeplink.batch_failed")
+            links.update((url, url) for url in batch)
+            continue
+        results = res['data']
+        for pos, entry in enumerate(results):
+            short = entry.get('shortenUrl')
+            # 응답의 originalUrl 로 매칭, 없으면 같은 순서라고 보고 위치로 매칭
+            origin = entry.get('originalUrl')
+            if origin not in batch and len(results) == len(batch):
+                origin = batch[pos]
+            if short and origin in batch:
+                links[origin] = short
+        missing += [url for url in batch if url not in links]
+
+    # 성공한 응답에서 일부만 빠진 경우에만 개별 요청으로 보충
+    if missing:
+        print(f">> ⚠️ 딥링크 {len(missing)}개 누락, 개별 재요청...")
+        for url in missing:
+            links[url] = make_deep_link(url)
+    return links
+
 def make_deep_link(origin_url):
-    dl_path = "/v2/providers/affiliate_open_api/apis/openapi/v1/deeplink"
     dl_data = {"coupangUrls": [origin_url]}
     
-    res = call_api("POST", dl_path, data=dl_data)
+    res = call_api("POST", DEEPLINK_PATH, data=dl_data)
     
     if res and res.get('rCode') == '0' and res.get('data'):
         return res['data'][0].get('shortenUrl')
     else:
         return origin_url
 
+# ============================================================================
+# 상품 피드 (여러 API 를 동시에 호출해서 합치기)
+#   COUPANG_FEEDS="goldbox,best:1016,search:생수@insta"  (기본: goldbox)
+#     goldbox           : 골드박스
+#     best:<카테고리ID>  : 카테고리 베스트
+#     search:<검색어>    : 검색 결과
+#     ...@<subId>       : 피드별 채널 ID (없으면 COUPANG_SUB_ID)
+# 같은 상품(세탁된 URL 기준)은 하나로 합치고, 여러 피드에 나온 상품 -> 피드 안 순위 순으로 정렬
+# ============================================================================
+API_PREFIX = "/v2/providers/affiliate_open_api/apis/openapi/v1"
+FEEDS = os.environ.get("COUPANG_FEEDS", "goldbox")
+SUB_ID = os.environ.get("COUPANG_SUB_ID")
+FEED_WORKERS = 4
+
+def parse_feeds(spec=None):
+    feeds = []
+    for name in (spec or FEEDS).split(","):
+        name = name.strip()
+        if not name:
+            continue
+        body, _, sub_id = name.partition("@")
+        kind, _, arg = body.partition(":")
+        feeds.append({"name": name, "kind": kind, "arg": arg, "sub_id": sub_id or SUB_ID})
+    return feeds
+
+def feed_request(feed, limit):
+    """피드 -> (API 경로, 파라미터)"""
+    if feed["kind"] == "goldbox":
+        path, params = f"{API_PREFIX}/products/goldbox", {}
+    elif feed["kind"] == "best":
+        path, params = f"{API_PREFIX}/products/bestcategories/{feed['arg']}", {}
+    elif feed["kind"] == "search":
+        path, params = f"{API_PREFIX}/products/search", {"keyword": feed["arg"]}
+    else:
+        raise ValueError(f"알 수 없는 피드: {feed['name']}")
+    params["limit"] = limit
+    if feed["sub_id"]:
+        params["subId"] = feed["sub_id"]
+    return path, params
+
+def fetch_feed(feed, limit):
+    path, params = feed_request(feed, limit)
+    result = call_api("GET", path, params=params)
+    data = (result or {}).get('data') or []
+    if isinstance(data, dict):  # 검색 API 는 {"productData": [...]}
+        data = data.get('productData') or []
+    return data
+
+def merge_feeds(results, limit):
+    """
+    results: [(피드 이름, 상품 목록)] (설정 순서)
+    세탁된 URL 로 중복을 없애고 (나온 피드 수 많은 순, 피드 안 최고 순위, 피드 순서) 로 정렬
+    """
+    merged = {}
+    for feed_index, (_, products) in enumerate(results):
+        for position, product in enumerate(products):
+            if not product.get('productUrl'):
+                continue
+            url = clean_coupang_url(product['productUrl'])
+            entry = merged.get(url)
+            if entry is None:
+                merged[url] = {"product": product, "hits": 1, "position": position, "feed": feed_index}
+            else:
+                entry["hits"] += 1
+                entry["position"] = min(entry["position"], position)
+    ranked = sorted(merged.values(), key=lambda e: (-e["hits"], e["position"], e["feed"]))
+    return [entry["product"] for entry in ranked[:limit]]
+
+def collect_products(limit=10, feeds=None):
+    """설정된 피드를 동시에 호출해서 합친 상품 목록 (쿠팡 API 원본 형식)"""
+    feeds = feeds or parse_feeds()
+    with ThreadPoolExecutor(max_workers=min(FEED_WORKERS, len(feeds))) as pool:
+        futures = [(feed["name"], pool.submit(fetch_feed, feed, limit)) for feed in feeds]
+        results = [(name, future.result()) for name, future in futures]
+    if len(feeds) > 1:
+        counts = ", ".join(f"{name} {len(products)}개" for name, products in results)
+        print(f">> 🧺 피드 {len(feeds)}개 동시 수집: {counts}")
+    return merge_feeds(results, limit)
+
 # 3. 메인 로직 (한국 시간 적용됨)
 def get_goldbox_items(limit=10):
     
@@ -92,24 +201,36 @@ def get_goldbox_items(limit=10):
 
     print(f">> 🚀 골드박스 데이터 수집 시작 (날짜: {date_str})...")
     
-    path = "/v2/providers/affiliate_open_api/apis/openapi/v1/products/goldbox"
-    params = {"limit": limit} 
-    result = call_api("GET", path, params=params)
+    products = collect_products(limit)
     
     items = []
     
-    if result and result.get('data'):
-        print(f">> 📦 {len(result['data'])}개 상품 발견. 변환 시작...")
+    if products:
+        print(f">> 📦 {len(products)}개 상품 발견. 변환 시작...")
+
+        # 딥링크: 캐시에 있는 건 재사용하고, 나머지만 한 번에 묶어서 요청
+        clean_urls = [clean_coupang_url(item['productUrl']) for item in products]
+        deep_links = {}
+        for url in clean_urls:
+            cached = deeplink_cache.get(url)
+            if cached: deep_links[url] = cached
+        to_request = [url for url in clean_urls if url not in deep_links]
+        if to_request:
+            new_links = make_deep_links(to_request)
+            for url, link in new_links.items():
+                deeplink_cache.put(url, link)
+            deep_links.update(new_links)
+        deeplink_cache.save()
         
-        for idx, item in enumerate(result['data']):
+        for idx, item in enumerate(products):
             price = item.get('productPrice') or item.get('salePrice') or item.get('price') or item.get('originalPrice', 0)
             
             # (1) 원본
             raw_url = item['productUrl']
             # (2) 세탁
             clean_url = clean_coupang_url(raw_url)
-            # (3) 딥링크
-            short_link = make_deep_link(clean_url)
+            # (3) 딥링크 (위에서 일괄 생성한 결과 사용)
+            short_link = deep_links.get(clean_url, clean_url)
             
             # ID에도 한국 날짜 적용
             item_id = f"{date_str}-{idx + 1:02d}"
@@ -121,11 +242,12 @@ def get_goldbox_items(limit=10):
                 "name": item['productName'],
                 "price": int(price),
                 "image_url": item['productImage'],
-                "link": short_link
+                "link": short_link,
+                "product_url": clean_url  # 딥링크 캐시 복원용
             })
 
             if idx == 0:
                 print(f"   ✨ [1위 확인] {short_link}")
 
-    print(f">> ✅ 총 {len(items)}개의 상품 처리 완료.")
+    print(f">> ✅ 총 {len(items)}개의 상품 처리 완료. ({deeplink_cache.summary()})")
     return items[:limit]
@@ -1,48 +1,136 @@
 import os
 import datetime
+import subprocess
 import sys
+import time
 
-def push_to_github():
+from src import metrics
+
+# ============================================================================
+# 깃허브 배포
+# - `git add .` 로 작업 폴더 전체(이미지 폴더 수백 개)를 훑는 대신,
+#   이번 실행이 만든 경로만 스테이징합니다. (오늘 이미지 폴더, data/, index.html, 청소로 지운 폴더)
+#   실행 기록(.cache/runs/)은 배포하지 않습니다. 예전 images/<날짜>/run_manifest.json 은 .gitignore 로 제외
+# - 바뀐 게 없으면 커밋을 건너뛰고, push 후에는 원격 브랜치 SHA 가 HEAD 와 같은지 확인합니다.
+# - 명령마다 종료코드/출력/걸린 시간을 모아 결과 dict 로 돌려줍니다.
+# ============================================================================
+DEPLOY_REMOTE = os.environ.get("DEPLOY_REMOTE", "origin")
+DEPLOY_BRANCH = os.environ.get("DEPLOY_BRANCH", "main")
+SITE_PATHS = ["data", "index.html"]     # 매일 바뀌는 사이트 파일
+GIT_TIMEOUT = 300
+
+def run_git(args, steps=None, check=True):
+    """git 명령 실행 -> CompletedProcess. steps 에 실행 기록(명령, 코드, 시간, 출력)을 남깁니다."""
+    start = time.time()
+    with metrics.span(f"git.{args[0]}"):
+        proc = subprocess.run(["git"] + args, capture_output=True, text=True, timeout=GIT_TIMEOUT)
+    if steps is not None:
+        steps.append({
+            "cmd": "git " + " ".join(args[:3]) + (" ..." if len(args) > 3 else ""),
+            "code": proc.returncode,
+            "elapsed": round(time.time() - start, 3),
+            "stdout": proc.stdout.strip()[-2000:],
+            "stderr": proc.stderr.strip()[-2000:],
+        })
+    if check and proc.returncode != 0:
+        raise RuntimeError(f"git {args[0]} 실패 (code {proc.returncode}): {proc.stderr.strip()}")
+    return proc
+
+def current_commit():
+    """현재 HEAD 커밋 SHA (실패 시 None)"""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def remote_commit(steps=None):
+    """원격 배포 브랜치가 가리키는 SHA (없거나 실패하면 None)"""
+    proc = run_git(["ls-remote", DEPLOY_REMOTE, f"refs/heads/{DEPLOY_BRANCH}"], steps, check=False)
+    if proc.returncode != 0 or not proc.stdout.strip():
+        return None
+    return proc.stdout.split()[0]
+
+def deploy_paths(date_str, removed=(), steps=None):
+    """스테이징할 경로: 있는 경로 + 지워졌지만 git 이 추적 중인 경로"""
+    paths = [p for p in [os.path.join("images", date_str)] + SITE_PATHS if os.path.exists(p)]
+    # 일부만 지운 폴더(원본만 정리하고 썸네일은 남김)는 폴더째 add -A
+    paths += [p for p in removed if os.path.exists(p) and p not in paths]
+    gone = [p for p in removed if not os.path.exists(p)]
+    if gone:
+        tracked = run_git(["ls-files", "-z", "--"] + gone, steps).stdout.split("\0")
+        paths += [p for p in gone if any(t == p or t.startswith(p.rstrip("/") + "/") for t in tracked if t)]
+    return paths
+
+def push_to_github(date_str=None, removed=()):
+    """
+    date_str: 오늘 이미지 폴더 날짜 (YYYYMMDD, 기본은 한국 시간 오늘)
+    removed: 청소 단계에서 지운 경로 목록 (삭제도 같이 커밋)
+    반환: {"ok", "committed", "pushed", "commit", "paths", "elapsed", "steps", "error"}
+    """
     print("\n🚀 [깃허브 배포] 업로드 프로세스 시작...")
-    
+    start = time.time()
+    if date_str is None:
+        date_str = (datetime.datetime.utcnow() + datetime.timedelta(hours=9)).strftime("%Y%m%d")
+    result = {"ok": False, "committed": False, "pushed": False, "commit": None,
+              "paths": [], "elapsed": 0.0, "steps": [], "error": None}
+    steps = result["steps"]
+
     # 1. 깃허브 저장소 연결 확인 (혹시 .git 폴더가 없을까봐)
     if not os.path.exists(".git"):
         print("❌ [오류] 현재 폴더에 .git 설정이 없습니다.")
         print("   터미널에서 'git init'과 'git remote add...' 설정을 먼저 해야 합니다.")
-        return False
+        result["error"] = ".git 없음"
+        return result
 
     try:
-        # 2. 변경사항 담기 (git add)
-        # 윈도우/맥 호환을 위해 os.system 사용
-        print("   - 변경된 파일 스캔 중...")
-        os.system("git add .")
-        
-        # 3. 커밋하기 (git commit)
-        now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        commit_message = f"Auto update: {now}"
-        print(f"   - 커밋 메시지 작성: {commit_message}")
-        
-        # 변경사항이 없으면 commit에서 에러가 날 수 있으니 || true 같은 처리가 좋지만
-        # 파이썬에서는 그냥 실행하고 넘어갑니다.
-        os.system(f'git commit -m "{commit_message}"')
-        
-        # 4. 밀어넣기 (git push)
-        print("   - 깃허브 서버로 전송 중 (Push)...")
-        # 윈도우 CMD에서는 한글 출력이 깨질 수 있어서 영어로 로그 남김
-        result = os.system("git push origin main") 
-        # 만약 'main' 브랜치가 아니라 'master'라면 "git push origin master"로 수정 필요
-
-        if result == 0:
-            print("✅ [성공] 깃허브 배포가 완료되었습니다!")
-            return True
+        # 2. 이번 실행이 만든 경로만 담기 (git add -A -- <경로>: 추가/수정/삭제 모두)
+        paths = deploy_paths(date_str, removed, steps)
+        result["paths"] = paths
+        print(f"   - 변경 경로 스테이징: {', '.join(paths) or '(없음)'}")
+        if paths:
+            run_git(["add", "-A", "--"] + paths, steps)
+
+        # 3. 커밋하기 (스테이징된 변경이 없으면 건너뜀)
+        if run_git(["diff", "--cached", "--quiet"], steps, check=False).returncode == 0:
+            print("   - 바뀐 파일이 없어 커밋을 건너뜁니다.")
+        else:
+            now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            commit_message = f"Auto update: {now}"
+            print(f"   - 커밋 메시지 작성: {commit_message}")
+            run_git(["commit", "-q", "-m", commit_message], steps)
+            result["committed"] = True
+
+        head = current_commit()
+        result["commit"] = head
+
+        # 4. 밀어넣기 (원격이 이미 같은 커밋이면 건너뜀)
+        if remote_commit(steps) == head:
+            print("   - 원격 브랜치가 이미 최신입니다. (Push 생략)")
         else:
-            print("⚠️ [주의] Push 과정에서 무언가 이상합니다. (에러코드 반환됨)")
-            return False
-        
+            print("   - 깃허브 서버로 전송 중 (Push)...")
+            run_git(["push", DEPLOY_REMOTE, f"HEAD:refs/heads/{DEPLOY_BRANCH}"], steps)
+            result["pushed"] = True
+
+            # 5. 원격 SHA 확인
+            pushed = remote_commit(steps)
+            if pushed != head:
+                raise RuntimeError(f"원격 SHA 불일치 (로컬 {head[:7]}, 원격 {(pushed or 'None')[:7]})")
+
+        result["ok"] = True
+        result["elapsed"] = round(time.time() - start, 3)
+        timings = ", ".join(f"{s['cmd'].split()[1]} {s['elapsed']:.1f}s" for s in steps)
+        print(f"✅ [성공] 깃허브 배포가 완료되었습니다! ({head[:7]}, {result['elapsed']:.1f}초 | {timings})")
+        return result
+
     except Exception as e:
-        print(f"❌ 배포 중 치명적 에러 발생: {e}")
-        return False
+        result["error"] = str(e)
+        result["elapsed"] = round(time.time() - start, 3)
+        print(f"❌ 배포 중 에러 발생: {e}")
+        for step in steps:
+            if step["code"] != 0 and step["stderr"]:
+                print(f"   - {step['cmd']} (code {step['code']}): {step['stderr']}")
+        return result
 
-# 이 파일만 단독으로 실행해서 테스트할 때 사용
+# 이 파일만 단독으로 실행해서 테스트할 때 사용 (python -m src.git_deploy [YYYYMMDD])
 if __name__ == "__main__":
-    push_to_github()
\ No newline at end of file
+    push_to_github(sys.argv[1] if len(sys.argv) > 1 else None)
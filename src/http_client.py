@@ -0,0 +1,119 @@
+import os
+import time
+import random
+import threading
+from urllib.parse import urlsplit
+
+from src import metrics
+
+# ============================================================================
+# 공용 HTTP 클라이언트
+# - 호스트별 Session(커넥션 풀 + keep-alive) 재사용 -> TLS 핸드셰이크 반복 제거
+# - 모든 요청에 (연결, 읽기) 타임아웃 기본 적용 -> 소켓 하나가 작업 전체를 멈추지 않게
+# - 429/5xx/연결 오류는 지터가 들어간 지수 백오프로 재시도
+# - 호스트별 요청 수/재시도/지연시간 통계
+# - requests 는 첫 요청 때 import (import 만 하는 도구/테스트는 빠르게 시작)
+# ============================================================================
+CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", "30"))
+DEFAULT_RETRIES = int(os.environ.get("HTTP_RETRIES", "3"))
+BACKOFF_BASE = 0.5      # 첫 재시도 대기(초), 이후 2배씩
+BACKOFF_MAX = 30.0
+POOL_SIZE = 16          # 호스트당 동시 연결 수 (이미지 병렬 다운로드 고려)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+_sessions = {}
+_lock = threading.Lock()
+stats = {}
+
+def _host(url):
+    return urlsplit(url).netloc
+
+def get_session(url):
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    host = _host(url)
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+            stats[host] = {"requests": 0, "retries": 0, "errors": 0, "latency": 0.0, "max_latency": 0.0}
+        return session
+
+def _record(host, elapsed=None, retry=False, error=False):
+    with _lock:
+        s = stats[host]
+        if elapsed is not None:
+            s["requests"] += 1
+            s["latency"] += elapsed
+            s["max_latency"] = max(s["max_latency"], elapsed)
+        if retry: s["retries"] += 1
+        if error: s["errors"] += 1
+
+def _backoff(attempt, response=None):
+    # 서버가 Retry-After 를 주면 그 값을 따릅니다
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX)
+    delay = min(BACKOFF_BASE * (2 ** attempt), BACKOFF_MAX)
+    return delay * random.uniform(0.5, 1.5)
+
+def request(method, url, retries=None, timeout=None, **kwargs):
+    """
+    requests.request 와 같은 사용법. 마지막 시도의 Response 를 그대로 돌려주고,
+    끝까지 연결이 안 되면 마지막 예외를 다시 던집니다.
+    retries=0 이면 재시도하지 않습니다. (인스타 최종 게시처럼 중복되면 안 되는 요청)
+    """
+    import requests
+
+    retries = DEFAULT_RETRIES if retries is None else retries
+    timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+    session = get_session(url)
+    host = _host(url)
+
+    for attempt in range(retries + 1):
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            _record(host, time.perf_counter() - start, error=True)
+            if attempt >= retries:
+                raise
+            _record(host, retry=True)
+            time.sleep(_backoff(attempt))
+            continue
+
+        _record(host, time.perf_counter() - start)
+        metrics.count("http.requests")
+        metrics.add_bytes("http_in", len(response.content))
+        if response.status_code in RETRY_STATUS and attempt < retries:
+            _record(host, retry=True)
+            time.sleep(_backoff(attempt, response))
+            continue
+        return response
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+def head(url, **kwargs):
+    return request("HEAD", url, **kwargs)
+
+def summary():
+    lines = []
+    with _lock:
+        for host, s in sorted(stats.items()):
+            if not s["requests"]:
+                continue
+            avg = s["latency"] / s["requests"] * 1000
+            lines.append(f"   - {host}: {s['requests']}회, 평균 {avg:.0f}ms, 최대 {s['max_latency'] * 1000:.0f}ms, "
+                         f"재시도 {s['retries']}회, 오류 {s['errors']}회")
+    return "🌐 [HTTP 통계]\n" + "\n".join(lines) if lines else "🌐 [HTTP 통계] 요청 없음"
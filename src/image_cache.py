@@ -0,0 +1,144 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+from src import http_client
+
+# ============================================================================
+# 상품 원본 이미지 디스크 캐시
+# - URL 해시(sha256)를 키로 .cache/images 아래에 저장
+# - ETag / Last-Modified 로 재검증 (304면 본문 안 받음)
+# - 용량 초과 시 가장 오래 안 쓴 파일부터 삭제 (LRU, 파일 mtime 기준)
+# ============================================================================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.environ.get("IMAGE_CACHE_DIR", os.path.join(BASE_DIR, ".cache", "images"))
+MAX_CACHE_BYTES = int(os.environ.get("IMAGE_CACHE_MAX_MB", "300")) * 1024 * 1024
+# 이 시간(초) 안에 받은 파일은 재검증 없이 바로 사용
+REVALIDATE_AFTER = int(os.environ.get("IMAGE_CACHE_REVALIDATE_SEC", str(24 * 3600)))
+
+_lock = threading.Lock()
+stats = {"hit": 0, "revalidated": 0, "miss": 0, "bytes_downloaded": 0, "bytes_saved": 0}
+
+def _paths(url):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.img"), os.path.join(CACHE_DIR, f"{key}.json")
+
+def _count(name, amount=1):
+    with _lock:
+        stats[name] += amount
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def _store(url, content, headers):
+    img_path, meta_path = _paths(url)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    meta = {
+        "url": url,
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "size": len(content),
+        "checked_at": time.time(),
+    }
+    # 쓰는 도중 다른 스레드가 반쯤 쓴 파일을 읽지 않도록 임시파일 후 교체
+    tmp_path = f"{img_path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, img_path)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    evict()
+
+def _touch(img_path, meta_path, meta):
+    meta["checked_at"] = time.time()
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.utime(img_path, None)
+
+def fetch(url, timeout=10):
+    """
+    캐시를 거쳐 이미지를 가져옵니다. (bytes 반환, 실패 시 예외)
+    """
+    import requests
+
+    img_path, meta_path = _paths(url)
+    meta = _read_meta(meta_path) if os.path.exists(img_path) else None
+
+    if meta:
+        with open(img_path, "rb") as f:
+            content = f.read()
+
+        # 최근에 확인한 파일이면 네트워크 없이 사용
+        if time.time() - meta.get("checked_at", 0) < REVALIDATE_AFTER:
+            os.utime(img_path, None)
+            _count("hit")
+            _count("bytes_saved", len(content))
+            return content
+
+        headers = {}
+        if meta.get("etag"): headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"): headers["If-Modified-Since"] = meta["last_modified"]
+        try:
+            res = http_client.get(url, headers=headers, timeout=timeout)
+        except requests.RequestException:
+            # 네트워크 오류 시 오래된 캐시라도 사용
+            _count("hit")
+            _count("bytes_saved", len(content))
+            return content
+
+        if res.status_code == 304:
+            _touch(img_path, meta_path, meta)
+            _count("revalidated")
+            _count("bytes_saved", len(content))
+            return content
+    else:
+        res = http_client.get(url, timeout=timeout)
+
+    res.raise_for_status()
+    _count("miss")
+    _count("bytes_downloaded", len(res.content))
+    _store(url, res.content, res.headers)
+    return res.content
+
+def evict(max_bytes=None):
+    """용량 초과분을 오래 안 쓴 순서대로 삭제합니다."""
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    with _lock:
+        try:
+            entries = [e for e in os.scandir(CACHE_DIR) if e.name.endswith(".img")]
+        except FileNotFoundError:
+            return 0
+        files = []
+        for entry in entries:
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= max_bytes:
+                break
+            for p in (path, path[:-4] + ".json"):
+                try:
+                    os.remove(p)
+                except FileNotFoundError:
+                    pass
+            total -= size
+            removed += 1
+        return removed
+
+def summary():
+    hits = stats["hit"] + stats["revalidated"]
+    total = hits + stats["miss"]
+    rate = (hits / total * 100) if total else 0.0
+    return (f"🗄️ [이미지 캐시] 적중 {hits}건 (재검증 {stats['revalidated']}) / 미스 {stats['miss']}건 "
+            f"({rate:.0f}%) | 다운로드 {stats['bytes_downloaded'] / 1024:.0f} KB, "
+            f"절약 {stats['bytes_saved'] / 1024:.0f} KB")
@@ -1,15 +1,28 @@
 import os
-import requests
+import time
+import hashlib
+import multiprocessing
+from contextlib import nullcontext
 from io import BytesIO
-from PIL import Image, ImageDraw, ImageFont
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from datetime import datetime
 
+from src import image_cache, card_cache, metrics, price_history
+
 # 설정값
 FONT_PATH = "fonts/GmarketSansBold.ttf" 
 CANVAS_SIZE = (1080, 1080)
 BG_COLOR = "white"
 ACCENT_COLOR = "#E60023"
 
+# 병렬 렌더링 설정 (환경변수 RENDER_WORKERS 로 조절 가능)
+RENDER_WORKERS = int(os.environ.get("RENDER_WORKERS", "0")) or min(8, os.cpu_count() or 1)
+DOWNLOAD_WORKERS = 10
+
+# 인스타용 JPEG 저장 옵션: 화질은 Pillow 기본(75)과 같게, 허프만 최적화 + 프로그레시브로 용량만 줄임
+JPEG_QUALITY = int(os.environ.get("JPEG_QUALITY", "75"))
+JPEG_OPTIONS = {"quality": JPEG_QUALITY, "optimize": True, "progressive": True}
+
 def draw_text_wrapper(draw, text, font, max_width, start_pos, color="black"):
     lines = []
     words = text.split()
@@ -30,83 +43,356 @@ def draw_text_wrapper(draw, text, font, max_width, start_pos, color="black"):
     return y
 
 def load_font(size):
+    from PIL import ImageFont
     try:
         return ImageFont.truetype(FONT_PATH, size)
     except OSError:
         return ImageFont.load_default()
 
-def create_cover(date_str, save_path):
-    img = Image.new("RGB", CANVAS_SIZE, BG_COLOR)
-    draw = ImageDraw.Draw(img)
-    font_lg = load_font(100)
-    font_md = load_font(60)
+def download_image(url):
+    """상품 원본 이미지를 (디스크 캐시를 거쳐) bytes로 돌려줍니다. (실패 시 None)"""
+    try:
+        with metrics.span("image.download") as attrs:
+            data = image_cache.fetch(url, timeout=10)
+            attrs["bytes"] = len(data) if data else 0
+            return data
+    except Exception as e:
+        print(f"   ⚠️ 이미지 다운로드 실패: {e}")
+        return None
 
-    dt = datetime.strptime(date_str, "%Y%m%d")
-    date_text = f"{dt.month}월 {dt.day}일"
-    
-    draw.text((100, 300), "오늘 단 하루!", font=font_md, fill="black")
-    draw.text((100, 400), "쿠팡 골드박스", font=font_lg, fill="black")
-    draw.text((100, 520), f"{date_text} 베스트 8", font=font_lg, fill=ACCENT_COLOR)
-    draw.text((100, 700), "▶ 옆으로 넘겨서 확인하세요", font=font_md, fill="gray") # 이모지 깨짐 방지
-    
-    img.save(save_path)
-    return os.path.getsize(save_path)
+# ============================================================================
+# 카드 렌더러 (폰트/고정 배경을 한 번만 만들어두고 카드마다 복사해서 사용)
+# - Pillow 는 실제로 그릴 때 import (렌더링 안 하는 실행/도구는 import 비용 없음)
+# ============================================================================
+class CardRenderer:
+    """
+    cached=False 로 만들면 예전처럼 매번 폰트를 새로 읽고 배경을 새로 그립니다.
+    (벤치마크 비교용)
+    """
+    def __init__(self, cached=True):
+        self.cached = cached
+        self._fonts = {}
+        self._templates = {}
 
-def create_product_card(item, save_path):
-    img = Image.new("RGB", CANVAS_SIZE, BG_COLOR)
-    draw = ImageDraw.Draw(img)
-    
-    font_rank = load_font(120)
-    font_name = load_font(50)
-    font_price = load_font(70)
-    font_id = load_font(30) 
+    def font(self, size):
+        if not self.cached:
+            return load_font(size)
+        if size not in self._fonts:
+            self._fonts[size] = load_font(size)
+        return self._fonts[size]
 
-    # 1. 이미지 (위치 Y=50)
-    try:
-        res = requests.get(item['image_url'], timeout=10)
-        p_img = Image.open(BytesIO(res.content))
+    def _template(self, name, builder):
+        if not self.cached:
+            return builder()
+        if name not in self._templates:
+            self._templates[name] = builder()
+        return self._templates[name].copy()
+
+    # ---- 고정 레이어 ----
+    def _blank(self):
+        from PIL import Image
+        return Image.new("RGB", CANVAS_SIZE, BG_COLOR)
+
+    def _cover_base(self):
+        from PIL import ImageDraw
+        img = self._blank()
+        draw = ImageDraw.Draw(img)
+        draw.text((100, 300), "오늘 단 하루!", font=self.font(60), fill="black")
+        draw.text((100, 400), "쿠팡 골드박스", font=self.font(100), fill="black")
+        draw.text((100, 700), "▶ 옆으로 넘겨서 확인하세요", font=self.font(60), fill="gray") # 이모지 깨짐 방지
+        return img
+
+    def _end_base(self):
+        from PIL import ImageDraw
+        img = self._blank()
+        draw = ImageDraw.Draw(img)
+        draw.text((100, 400), "구매 링크는", font=self.font(80), fill="black")
+        draw.text((100, 500), "프로필 상단 클릭!", font=self.font(80), fill=ACCENT_COLOR)
+        draw.text((100, 650), "매일 아침 8시 업데이트", font=self.font(50), fill="gray")
+        return img
+
+    # ---- 카드 그리기 (PIL Image 반환) ----
+    def render_cover(self, date_str):
+        from PIL import ImageDraw
+        img = self._template("cover", self._cover_base)
+        draw = ImageDraw.Draw(img)
+
+        dt = datetime.strptime(date_str, "%Y%m%d")
+        date_text = f"{dt.month}월 {dt.day}일"
+        draw.text((100, 520), f"{date_text} 베스트 8", font=self.font(100), fill=ACCENT_COLOR)
+        return img
+
+    def product_layer(self, item, image_bytes):
+        """상품 레이어: 원본 사진 + 상품명 + 가격 (순위/번호가 바뀌어도 그대로 재사용)"""
+        from PIL import Image, ImageDraw
+        img = self._template("product", self._blank)
+        draw = ImageDraw.Draw(img)
+
+        # 1. 이미지 (위치 Y=50)
+        p_img = Image.open(BytesIO(image_bytes))
         p_img = p_img.resize((800, 800)) 
         img.paste(p_img, (140, 50)) 
+
+        # 2. 상품명 (Y=860)
+        text_y = 860
+        text_y = draw_text_wrapper(draw, item['name'], self.font(50), 900, (90, text_y))
+        
+        # 3. 가격
+        price_txt = f"{item['price']:,}원" 
+        draw.text((90, text_y + 15), price_txt, font=self.font(70), fill=ACCENT_COLOR)
+        return img
+
+    def render_overlay(self, layer, item):
+        """날마다 바뀌는 부분(순위, 일련번호, 가격 배지)만 상품 레이어 위에 그립니다."""
+        from PIL import ImageDraw
+        img = layer.copy()
+        draw = ImageDraw.Draw(img)
+
+        # 4. 순위
+        draw.text((50, 40), str(item['rank']), font=self.font(120), fill=ACCENT_COLOR)
+
+        # 5. 일련번호
+        font_id = self.font(30)
+        id_text = f"No. {item['id']}"
+        bbox = draw.textbbox((0, 0), id_text, font=font_id)
+        text_width = bbox[2] - bbox[0]
+        draw.text((1080 - text_width - 50, 1020), id_text, font=font_id, fill="gray")
+
+        # 6. 가격 배지 (역대 최저가 / 평소보다 N% 저렴) - 사진 오른쪽 위
+        badge = price_history.price_badge(item)
+        if badge:
+            font_badge = self.font(40)
+            bbox = draw.textbbox((0, 0), badge, font=font_badge)
+            width, height = bbox[2] - bbox[0], bbox[3] - bbox[1]
+            x, y = 1080 - 60 - width - 2 * 20, 60
+            draw.rounded_rectangle((x, y, x + width + 2 * 20, y + height + 2 * 14), radius=14, fill=ACCENT_COLOR)
+            draw.text((x + 20 - bbox[0], y + 14 - bbox[1]), badge, font=font_badge, fill="white")
+        return img
+
+    def render_product(self, item, image_bytes):
+        return self.render_overlay(self.product_layer(item, image_bytes), item)
+
+    def render_end(self):
+        return self._template("end", self._end_base)
+
+# 프로세스마다 렌더러 하나만 만들어서 재사용 (프로세스 풀 워커 포함)
+_renderer = None
+
+def get_renderer():
+    global _renderer
+    if _renderer is None:
+        _renderer = CardRenderer()
+    return _renderer
+
+def save_jpeg(img, save_path):
+    img.save(save_path, "JPEG", **JPEG_OPTIONS)
+    return os.path.getsize(save_path)
+
+# ============================================================================
+# 카드 만들기 (내용 해시가 같은 카드는 card_cache 에서 재사용)
+# - 반환: (파일 크기, 캐시 결과)  캐시 결과: "card" 완성 카드 재사용 / "layer" 상품 레이어 재사용 / "miss"
+# ============================================================================
+def _cached_card(card_key, save_path, render):
+    size = card_cache.restore_card(card_key, save_path)
+    if size is not None:
+        return size, "card"
+    img, status = render()
+    size = save_jpeg(img, save_path)
+    card_cache.store_card(card_key, save_path)
+    return size, status
+
+def _create_cover(date_str, save_path):
+    card_key = card_cache.key(render_version(), "cover", date_str)
+    return _cached_card(card_key, save_path, lambda: (get_renderer().render_cover(date_str), "miss"))
+
+def _create_end_card(save_path):
+    card_key = card_cache.key(render_version(), "end")
+    return _cached_card(card_key, save_path, lambda: (get_renderer().render_end(), "miss"))
+
+def _create_product_card(item, save_path, image_bytes):
+    renderer = get_renderer()
+    # 카드 모양을 정하는 입력 전부: 디자인 버전 + 원본 이미지 bytes + 상품명/가격 (+ 순위/번호/배지)
+    layer_key = card_cache.key(render_version(), hashlib.sha256(image_bytes).hexdigest(), item['name'], item['price'])
+    card_key = card_cache.key(layer_key, item['rank'], item['id'], price_history.price_badge(item))
+
+    def render():
+        layer = card_cache.load_layer(layer_key)
+        status = "layer"
+        if layer is None:
+            layer = renderer.product_layer(item, image_bytes)
+            card_cache.store_layer(layer_key, layer)
+            status = "miss"
+        return renderer.render_overlay(layer, item), status
+
+    return _cached_card(card_key, save_path, render)
+
+def _render_product(item, save_path, image_bytes=None):
+    # 원본 이미지를 미리 받아오지 않았다면 여기서 다운로드
+    if image_bytes is None:
+        image_bytes = download_image(item['image_url'])
+        if image_bytes is None:
+            return 0, None
+
+    try:
+        size, status = _create_product_card(item, save_path, image_bytes)
     except Exception as e:
         print(f"   ⚠️ 이미지 실패: {e}")
-        return 0
+        return 0, None
 
-    # 2. 순위
-    draw.text((50, 40), str(item['rank']), font=font_rank, fill=ACCENT_COLOR)
-    
-    # 3. 상품명 (Y=860)
-    text_y = 860
-    text_y = draw_text_wrapper(draw, item['name'], font_name, 900, (90, text_y))
-    
-    # 4. 가격
-    price_txt = f"{item['price']:,}원" 
-    draw.text((90, text_y + 15), price_txt, font=font_price, fill=ACCENT_COLOR)
+    print(f"   📸 상품{item['rank']} 완료")
+    return size, status
 
-    # 5. 일련번호
-    id_text = f"No. {item['id']}"
-    bbox = draw.textbbox((0, 0), id_text, font=font_id)
-    text_width = bbox[2] - bbox[0]
-    draw.text((1080 - text_width - 50, 1020), id_text, font=font_id, fill="gray")
+def create_cover(date_str, save_path):
+    return _create_cover(date_str, save_path)[0]
 
-    img.save(save_path)
-    print(f"   📸 상품{item['rank']} 완료")
-    return os.path.getsize(save_path)
+def create_product_card(item, save_path, image_bytes=None):
+    return _render_product(item, save_path, image_bytes)[0]
 
 def create_end_card(save_path):
-    img = Image.new("RGB", CANVAS_SIZE, BG_COLOR)
-    draw = ImageDraw.Draw(img)
-    font_lg = load_font(80)
-    font_md = load_font(50)
-
-    draw.text((100, 400), "구매 링크는", font=font_lg, fill="black")
-    draw.text((100, 500), "프로필 상단 클릭!", font=font_lg, fill=ACCENT_COLOR)
-    draw.text((100, 650), "매일 아침 8시 업데이트", font=font_md, fill="gray")
-    
-    img.save(save_path)
-    return os.path.getsize(save_path)
+    return _create_end_card(save_path)[0]
+
+# ============================================================================
+# 병렬 렌더링 작업 단위 (프로세스 풀에서 실행되므로 최상위 함수여야 함)
+# ============================================================================
+def process_pool(workers):
+    """
+    렌더링용 프로세스 풀 (backfill 도 같이 씀)
+    파이프라인은 다른 스레드(다운로드, 다른 단계)가 도는 중에 풀을 만들기 때문에
+    리눅스 기본값 fork 를 쓰면 다른 스레드가 잡고 있던 락까지 복사돼 워커가 멈출 수 있습니다.
+    -> 깨끗한 프로세스에서 워커를 띄우는 forkserver (없는 OS 는 spawn)
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+
+def _render_job(kind, args):
+    """반환: (파일 크기, 걸린 시간, 시작 시각, pid, 캐시 결과) - 시작 시각/pid/캐시 결과는 실행 보고서용"""
+    started_at = time.time()
+    start = time.perf_counter()
+    if kind == "cover":
+        size, status = _create_cover(*args)
+    elif kind == "end":
+        size, status = _create_end_card(*args)
+    else:
+        size, status = _render_product(*args)
+    return size, time.perf_counter() - start, started_at, os.getpid(), status
+
+def _record_render(name, kind, job_result):
+    # 캐시 적중 집계는 부모 프로세스에서 (워커 프로세스의 stats 는 따로 놀기 때문)
+    size, elapsed, started_at, pid, status = job_result
+    metrics.record("render.card", started_at, started_at + elapsed, card=name, kind=kind, bytes=size, pid=pid, cache=status)
+    if status:
+        card_cache.record(status)
+        metrics.count(f"card_cache.{status}")
+    return size, elapsed
+
+def _render_serial(jobs):
+    """기존 방식: 한 장씩 순서대로 생성"""
+    results = {}
+    for name, kind, args in jobs:
+        results[name] = _record_render(name, kind, _render_job(kind, args))
+    return results
+
+def _render_parallel(jobs, items, workers, pool=None):
+    """
+    다운로드는 스레드 풀로 동시에 받고,
+    받는 즉시 Pillow 합성/JPEG 인코딩을 프로세스 풀로 넘깁니다.
+    pool: 이미 만든 프로세스 풀 (여러 번 나눠 부를 때 워커의 폰트/배경 캐시 재사용)
+    """
+    results = {}
+    download_times = {}
+    render_futures = {}
+
+    with (nullcontext(pool) if pool else process_pool(workers)) as renderer, \
+         ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, max(1, len(items)))) as downloader:
+
+        # 표지/엔딩은 다운로드가 필요 없으니 바로 렌더링
+        for name, kind, args in jobs:
+            if kind != "product":
+                render_futures[renderer.submit(_render_job, kind, args)] = (name, kind)
+
+        def timed_download(url):
+            start = time.perf_counter()
+            data = download_image(url)
+            return data, time.perf_counter() - start
+
+        product_jobs = [(name, args) for name, kind, args in jobs if kind == "product"]
+        download_futures = {
+            downloader.submit(timed_download, args[0]['image_url']): (name, args)
+            for name, args in product_jobs
+        }
+
+        for future in as_completed(download_futures):
+            name, (item, save_path) = download_futures[future]
+            image_bytes, elapsed = future.result()
+            download_times[name] = elapsed
+            if image_bytes is None:
+                results[name] = (0, elapsed)
+                continue
+            job_args = (item, save_path, image_bytes)
+            render_futures[renderer.submit(_render_job, "product", job_args)] = (name, "product")
+
+        for future in as_completed(render_futures):
+            name, kind = render_futures[future]
+            try:
+                size, elapsed = _record_render(name, kind, future.result())
+            except Exception as e:
+                print(f"   ⚠️ {name} 렌더링 실패: {e}")
+                size, elapsed = 0, 0.0
+            results[name] = (size, elapsed + download_times.get(name, 0.0))
+
+    return results
+
+def build_jobs(items, save_dir, prefix=""):
+    """하루치 카드 작업 (이름, 종류, 인자) 목록 - 순서가 곧 결과 출력 순서"""
+    date_str = items[0]['date']
+    jobs = [(f"{prefix}00", "cover", (date_str, f"{save_dir}/00_cover.jpg"))]
+    for item in items:
+        filename = f"{item['rank']:02d}.jpg" 
+        jobs.append((f"{prefix}{item['rank']:02d}", "product", (item, f"{save_dir}/{filename}")))
+    jobs.append((f"{prefix}11", "end", (f"{save_dir}/11_end.jpg",)))
+    return jobs
+
+def render_jobs(jobs, items, parallel=True, workers=None, pool=None):
+    """작업 목록 렌더링 -> {이름: (파일 크기, 걸린 시간)}"""
+    workers = workers or RENDER_WORKERS
+    if parallel and (workers > 1 or pool):
+        try:
+            return _render_parallel(jobs, items, workers, pool)
+        except (OSError, NotImplementedError) as e:
+            # 프로세스 풀을 쓸 수 없는 환경이면 순차 실행으로 대체
+            print(f"   ⚠️ 병렬 실행 불가 ({e}), 순차 실행으로 전환합니다.")
+    return _render_serial(jobs)
+
+_version = None
+
+def render_version():
+    """
+    카드 디자인 버전: 이 파일 소스 + 폰트 + 캔버스/JPEG 설정의 해시
+    (backfill 최신 여부 판단, card_cache 키에 사용 - 카드마다 부르므로 프로세스당 한 번만 계산)
+    """
+    global _version
+    if _version is None:
+        _version = _compute_render_version()
+    return _version
+
+def _compute_render_version():
+    sha = hashlib.sha256()
+    with open(os.path.abspath(__file__), "rb") as f:
+        sha.update(f.read())
+    if os.path.exists(FONT_PATH):
+        sha.update(str(os.path.getsize(FONT_PATH)).encode())
+    sha.update(repr((CANVAS_SIZE, BG_COLOR, ACCENT_COLOR, sorted(JPEG_OPTIONS.items()))).encode())
+    return sha.hexdigest()[:12]
+
+def render_stamp(items):
+    """하루치 카드가 어떤 디자인/입력으로 만들어졌는지 (run_manifest 에 기록)"""
+    inputs = [[item['rank'], item['id'], item['name'], item['price'], item.get('image_url'),
+               price_history.price_badge(item)] for item in items]
+    inputs_hash = hashlib.sha256(repr(sorted(inputs)).encode("utf-8")).hexdigest()[:12]
+    return {"version": render_version(), "inputs": inputs_hash}
 
 # [핵심] 이 함수가 꼭 있어야 합니다!
-def main(items):
+def main(items, parallel=True, workers=None):
     if not items: return
 
     date_str = items[0]['date']
@@ -114,25 +400,28 @@ def main(items):
     if not os.path.exists(save_dir): os.makedirs(save_dir)
     
     print(f"\n📂 저장 폴더: {save_dir}")
-    total_size = 0
-    count = 0
+    workers = workers or RENDER_WORKERS
+    jobs = build_jobs(items, save_dir)
 
-    total_size += create_cover(date_str, f"{save_dir}/00_cover.jpg")
-    count += 1
+    start = time.perf_counter()
+    if parallel and workers > 1:
+        print(f"   ⚡ 병렬 렌더링 (워커 {workers}개)")
+    results = render_jobs(jobs, items, parallel, workers)
+    wall_time = time.perf_counter() - start
 
-    for item in items:
-        filename = f"{item['rank']:02d}.jpg" 
-        save_path = f"{save_dir}/{filename}"
-        s = create_product_card(item, save_path)
-        if s > 0:
-            total_size += s
-            count += 1
-
-    total_size += create_end_card(f"{save_dir}/11_end.jpg")
-    count += 1
-    
+    total_size = sum(size for size, _ in results.values())
+    count = sum(1 for size, _ in results.values() if size > 0)
+    timings = [(name, results[name][1]) for name, _, _ in jobs if name in results]
+    slowest = max(timings, key=lambda t: t[1]) if timings else ("-", 0.0)
+
+    metrics.count("images.rendered", count)
+    metrics.add_bytes("images_jpeg", total_size)
     mb_size = total_size / (1024 * 1024)
-    print(f"📊 [이미지 생성 완료] 총 {count}장 ({mb_size:.2f} MB)")
+    print(f"📊 [이미지 생성 완료] 총 {count}장 ({mb_size:.2f} MB) | ⏱️ {wall_time:.2f}초 (최장 {slowest[0]}: {slowest[1]:.2f}초)")
+    print("   - 카드별: " + ", ".join(f"{name} {t:.2f}s" for name, t in timings))
+    print(image_cache.summary())
+    print(card_cache.summary())
+    card_cache.evict()
 
 if __name__ == "__main__":
     pass
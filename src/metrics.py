@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# ============================================================================
+# 실행 측정 (가벼운 계측 레이어)
+# - span(): with 블록 하나의 시작/끝 시각 기록 (단계, API 호출, 카드 렌더링, git, 웹 반영 대기 ...)
+# - count() / add_bytes(): 횟수와 바이트 누적
+# - 실행이 끝나면 날짜별 JSON 보고서(.cache/reports/<날짜>.json)를 쓰고,
+#   텔레그램 성공 메시지에 요약을 붙입니다.
+# - METRICS_TRACE=1 이면 크롬 트레이스(chrome://tracing, Perfetto) 파일도 같이 씁니다.
+# ============================================================================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORT_DIR = os.environ.get("METRICS_DIR", os.path.join(BASE_DIR, ".cache", "reports"))
+EXPORT_TRACE = os.environ.get("METRICS_TRACE", "0") == "1"
+
+_lock = threading.Lock()
+_spans = []
+counters = {}
+_started_at = time.time()
+
+def reset():
+    global _started_at
+    with _lock:
+        _spans.clear()
+        counters.clear()
+        _started_at = time.time()
+
+def record(name, start, end, **attrs):
+    """이미 잰 구간을 기록합니다. (프로세스 풀 작업처럼 with 로 감쌀 수 없는 경우)"""
+    entry = {"name": name, "start": start, "end": end,
+             "pid": attrs.pop("pid", os.getpid()), "tid": attrs.pop("tid", threading.get_ident())}
+    if attrs:
+        entry["attrs"] = attrs
+    with _lock:
+        _spans.append(entry)
+
+@contextmanager
+def span(name, **attrs):
+    """
+    with metrics.span("coupang.call_api", path=...):
+        ...
+    예외가 나면 error 속성을 남기고 예외는 그대로 올립니다.
+    """
+    start = time.time()
+    try:
+        yield attrs
+    except BaseException as e:
+        attrs["error"] = e.__class__.__name__
+        raise
+    finally:
+        record(name, start, time.time(), **attrs)
+
+def count(name, n=1):
+    with _lock:
+        counters[name] = counters.get(name, 0) + n
+
+def add_bytes(name, n):
+    count(f"bytes.{name}", n or 0)
+
+# ----------------------------------------------------------------------------
+# 보고서
+# ----------------------------------------------------------------------------
+def aggregate():
+    """이름별 {count, total, max, errors} (초)"""
+    result = {}
+    with _lock:
+        spans = list(_spans)
+    for s in spans:
+        agg = result.setdefault(s["name"], {"count": 0, "total": 0.0, "max": 0.0, "errors": 0})
+        elapsed = s["end"] - s["start"]
+        agg["count"] += 1
+        agg["total"] += elapsed
+        agg["max"] = max(agg["max"], elapsed)
+        if "error" in s.get("attrs", {}):
+            agg["errors"] += 1
+    for agg in result.values():
+        agg["total"] = round(agg["total"], 3)
+        agg["max"] = round(agg["max"], 3)
+    return result
+
+def report(date_str=None, **extra):
+    with _lock:
+        spans = [dict(s, start=round(s["start"] - _started_at, 4), end=round(s["end"] - _started_at, 4))
+                 for s in _spans]
+        data = {"date": date_str, "started_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(_started_at)),
+                "elapsed": round(time.time() - _started_at, 3), "counters": dict(counters)}
+    data["aggregate"] = aggregate()
+    data["spans"] = spans
+    data.update(extra)
+    return data
+
+def chrome_trace():
+    """Chrome Trace Event 형식 (마이크로초 단위 'X' 이벤트)"""
+    with _lock:
+        spans = list(_spans)
+    events = [{"name": s["name"], "cat": s["name"].split(".")[0], "ph": "X",
+               "ts": int((s["start"] - _started_at) * 1e6), "dur": int((s["end"] - s["start"]) * 1e6),
+               "pid": s["pid"], "tid": s["tid"], "args": s.get("attrs", {})} for s in spans]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1, default=str)
+    os.replace(tmp_path, path)
+
+def save_report(date_str, trace=None, **extra):
+    """보고서(.cache/reports/<날짜>.json)와 (선택) 크롬 트레이스를 씁니다. 반환: 보고서 경로"""
+    path = os.path.join(REPORT_DIR, f"{date_str}.json")
+    _write_json(path, report(date_str, **extra))
+    if EXPORT_TRACE if trace is None else trace:
+        _write_json(os.path.join(REPORT_DIR, f"{date_str}.trace.json"), chrome_trace())
+    print(f"📈 [실행 보고서] {os.path.relpath(path, BASE_DIR)}")
+    return path
+
+def summary(top=5):
+    """텔레그램용 짧은 요약: 단계별 시간 + 오래 걸린 세부 작업 + 주요 카운터"""
+    agg = aggregate()
+    lines = []
+    stages = [(name[6:], a) for name, a in agg.items() if name.startswith("stage.")]
+    if stages:
+        lines.append("⏱️ " + ", ".join(f"{name} {a['total']:.1f}s" for name, a in stages))
+    details = sorted(((n, a) for n, a in agg.items() if not n.startswith("stage.")),
+                     key=lambda kv: kv[1]["total"], reverse=True)[:top]
+    for name, a in details:
+        err = f", 실패 {a['errors']}" if a["errors"] else ""
+        lines.append(f"- {name}: {a['count']}회 {a['total']:.1f}s (최대 {a['max']:.1f}s{err})")
+    with _lock:
+        byte_counters = {k[6:]: v for k, v in counters.items() if k.startswith("bytes.")}
+    if byte_counters:
+        lines.append("📦 " + ", ".join(f"{k} {v / (1024 * 1024):.1f}MB" for k, v in sorted(byte_counters.items())))
+    return "\n".join(lines)
@@ -0,0 +1,132 @@
+import os
+import sys
+import time
+from io import BytesIO
+
+from src import metrics
+
+# ============================================================================
+# 이미지 최적화 (렌더링 다음 단계)
+# - 인스타용 1080px JPEG 는 make_image 가 JPEG_OPTIONS(optimize + progressive)로 바로 저장합니다.
+#   여기서 다시 인코딩하지 않음 -> 화질 손실 누적 없음
+# - 사이트 지난 날짜/검색 카드(약 160~300px)용 썸네일을 images/<날짜>/thumb/ 에 만듭니다.
+#   THUMB_SIZE(기본 320) 는 <이름>.webp, 2배 크기(640, 고해상도 휴대폰용)는 <이름>-640w.webp
+#   원본 JPEG 는 보존 기간(30일)이 지나면 지워지므로 그 뒤로는 이 두 크기만 남습니다.
+#   WebP 는 항상, AVIF 는 IMAGE_AVIF=1 이고 Pillow 가 지원할 때만
+# - 실행마다 절약된 바이트를 보고합니다.
+# ============================================================================
+THUMB_DIR = "thumb"
+THUMB_SIZE = int(os.environ.get("THUMB_SIZE", "320"))   # 160px 카드 x 2배 (고해상도 화면)
+THUMB_SIZES = [THUMB_SIZE, THUMB_SIZE * 2]              # 2~3배율 화면의 50vw 카드용 640w
+WEBP_OPTIONS = {"quality": 75, "method": 6}
+AVIF_OPTIONS = {"quality": 50}
+ENABLE_AVIF = os.environ.get("IMAGE_AVIF", "0") == "1"
+
+def thumb_formats():
+    formats = [("webp", "WEBP", WEBP_OPTIONS)]
+    if ENABLE_AVIF:
+        from PIL import features
+        if features.check("avif"):
+            formats.append(("avif", "AVIF", AVIF_OPTIONS))
+    return formats
+
+def thumb_filename(stem, ext, size):
+    # 기본 크기는 예전 이름 그대로 (이미 배포된 썸네일/페이지와 호환)
+    return f"{stem}.{ext}" if size == THUMB_SIZE else f"{stem}-{size}w.{ext}"
+
+def _default_jpeg_size(img):
+    """Pillow 기본 설정으로 저장했다면 몇 바이트였을지 (절약량 추정용)"""
+    buf = BytesIO()
+    img.save(buf, "JPEG")
+    return buf.tell()
+
+def make_thumbnails(date_str, base_dir="images", force=False):
+    """
+    images/<날짜>/*.jpg -> images/<날짜>/thumb/<이름>.webp, <이름>-640w.webp (.avif)
+    원본보다 새 썸네일이 이미 있으면 건너뜁니다. 반환: 통계 dict
+    깨진 JPEG 는 건너뛰고 report["errors"] 에 (파일 이름, 오류) 로 남깁니다.
+    """
+    from PIL import Image
+    folder = os.path.join(base_dir, date_str)
+    thumb_folder = os.path.join(folder, THUMB_DIR)
+    report = {"cards": 0, "skipped": 0, "jpeg_bytes": 0, "jpeg_default_bytes": 0, "thumb_bytes": {}, "errors": []}
+    if not os.path.isdir(folder):
+        return report
+    os.makedirs(thumb_folder, exist_ok=True)
+    formats = thumb_formats()
+
+    for entry in sorted(os.scandir(folder), key=lambda e: e.name):
+        if not entry.is_file() or not entry.name.endswith(".jpg"):
+            continue
+        stem = entry.name[:-4]
+        src_mtime = entry.stat().st_mtime
+        targets = [(ext, fmt, opts, size, os.path.join(thumb_folder, thumb_filename(stem, ext, size)))
+                   for size in THUMB_SIZES for ext, fmt, opts in formats]
+
+        if not force and all(os.path.exists(p) and os.path.getmtime(p) >= src_mtime for *_, p in targets):
+            report["skipped"] += 1
+            for ext, _, _, _, path in targets:
+                report["thumb_bytes"][ext] = report["thumb_bytes"].get(ext, 0) + os.path.getsize(path)
+            report["jpeg_bytes"] += entry.stat().st_size
+            report["jpeg_default_bytes"] += entry.stat().st_size
+            continue
+
+        try:
+            with Image.open(entry.path) as img:
+                img = img.convert("RGB")
+                default_size = _default_jpeg_size(img)
+                thumbs = {size: img.resize((size, size), Image.LANCZOS) for size in THUMB_SIZES}
+            saved = []
+            for ext, fmt, opts, size, path in targets:
+                tmp_path = path + ".tmp"
+                thumbs[size].save(tmp_path, fmt, **opts)
+                os.replace(tmp_path, path)
+                saved.append((ext, os.path.getsize(path)))
+        except Exception as e:
+            # 한 장이 깨져도 나머지 카드는 계속 (만들다 만 임시 파일은 정리)
+            print(f"   ⚠️ 썸네일 생성 실패 {entry.path}: {e}")
+            report["errors"].append((entry.name, str(e)))
+            for *_, path in targets:
+                if os.path.exists(path + ".tmp"):
+                    os.remove(path + ".tmp")
+            continue
+
+        report["jpeg_bytes"] += entry.stat().st_size
+        report["jpeg_default_bytes"] += default_size
+        for ext, size in saved:
+            report["thumb_bytes"][ext] = report["thumb_bytes"].get(ext, 0) + size
+        report["cards"] += 1
+
+    return report
+
+def format_report(report):
+    kb = lambda n: f"{n / 1024:,.0f}KB"
+    jpeg = report["jpeg_bytes"]
+    saved_jpeg = report["jpeg_default_bytes"] - jpeg
+    line = f"📊 [이미지 최적화] 새 썸네일 {report['cards']}장 (재사용 {report['skipped']}장) | JPEG {kb(jpeg)}"
+    if saved_jpeg > 0:
+        line += f" (기본 설정 대비 {kb(saved_jpeg)} 절약)"
+    if report.get("errors"):
+        line += f" | ⚠️ 실패 {len(report['errors'])}장"
+    for ext, size in report["thumb_bytes"].items():
+        ratio = (1 - size / jpeg) * 100 if jpeg else 0
+        line += f" | {ext} 썸네일 {kb(size)} (사이트 로딩 {ratio:.0f}% 감소)"
+    return line
+
+def main(items):
+    if not items: return
+    start = time.perf_counter()
+    report = make_thumbnails(items[0]['date'])
+    report["elapsed"] = round(time.perf_counter() - start, 3)
+    for ext, size in report["thumb_bytes"].items():
+        metrics.add_bytes(f"thumbs_{ext}", size)
+    print(format_report(report) + f" | ⏱️ {report['elapsed']:.2f}초")
+    return report
+
+# 지난 날짜 썸네일 일괄 생성: python -m src.optimize_image 20260101 20260102 ...  (all = 전체)
+if __name__ == "__main__":
+    dates = sys.argv[1:]
+    if dates == ["all"]:
+        dates = sorted(d for d in os.listdir("images") if len(d) == 8 and d.isdigit())
+    for date_str in dates:
+        print(f"{date_str}: " + format_report(make_thumbnails(date_str)))
@@ -0,0 +1,97 @@
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src import http_client, metrics
+
+# ============================================================================
+# 깃허브 페이지 배포 반영 확인
+# - 인스타가 가져갈 이미지 URL 전부를 동시에 확인합니다. (표지 한 장만 보지 않음)
+# - 1.5초부터 1.5배씩 늘어나는 백오프로 다시 확인 -> 반영되는 즉시 다음 단계로
+# - verify="size" 면 Content-Length 를, "hash" 면 내용 sha256 을 로컬 파일과 비교해서
+#   CDN 에 남아 있는 옛날 파일(같은 날짜 재실행 등)을 반영된 것으로 착각하지 않게 합니다.
+# ============================================================================
+FIRST_DELAY = 1.5
+MAX_DELAY = 30.0
+TIMEOUT = 600
+PROBE_WORKERS = 8
+
+def _sha256_file(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def probe(url, local_path=None, verify="size"):
+    """URL 이 (로컬 파일과 같은 내용으로) 떠 있으면 True, 아니면 이유 문자열"""
+    try:
+        if verify == "hash" and local_path:
+            res = http_client.get(url, retries=0)
+        else:
+            res = http_client.head(url, retries=0)
+    except Exception as e:
+        return f"에러 {e.__class__.__name__}"
+
+    if res.status_code != 200:
+        return f"응답 {res.status_code}"
+    if not local_path or not os.path.exists(local_path) or not verify:
+        return True
+
+    if verify == "hash":
+        if hashlib.sha256(res.content).hexdigest() != _sha256_file(local_path):
+            return "내용 불일치(옛날 파일)"
+        return True
+
+    remote_size = res.headers.get("Content-Length")
+    # 압축 전송 등으로 길이를 안 주면 크기 비교는 건너뜁니다
+    if remote_size and res.headers.get("Content-Encoding") in (None, "identity"):
+        if int(remote_size) != os.path.getsize(local_path):
+            return f"크기 불일치 ({remote_size} != {os.path.getsize(local_path)})"
+    return True
+
+def wait_until_live(targets, verify="size", timeout=TIMEOUT, deployed_at=None):
+    """
+    targets: [(url, 로컬 경로 또는 None), ...]
+    deployed_at: push 완료 시각(time.time()) - 주면 배포 후 반영까지 걸린 시간도 출력
+    반환: 반영까지 걸린 시간(초), 시간 초과면 None
+    """
+    with metrics.span("pages.wait", urls=len(targets), verify=verify) as attrs:
+        elapsed = _wait_until_live(targets, verify, timeout, deployed_at)
+        attrs["ready"] = elapsed is not None
+        return elapsed
+
+def _wait_until_live(targets, verify, timeout, deployed_at):
+    pending = dict(targets)
+    start = time.time()
+    delay = FIRST_DELAY
+    attempt = 0
+
+    print(f"\n📡 [웹 반영 확인] 이미지 {len(pending)}장 응답 대기 중... (검증: {verify or '없음'})")
+    while True:
+        attempt += 1
+        urls = list(pending)
+        with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(urls))) as pool:
+            results = dict(zip(urls, pool.map(lambda u: probe(u, pending[u], verify), urls)))
+
+        for url, result in results.items():
+            if result is True:
+                pending.pop(url)
+
+        if not pending:
+            elapsed = time.time() - start
+            msg = f"   ✅ [성공] 이미지 {len(targets)}장 모두 반영 확인 ({elapsed:.1f}초, 확인 {attempt}회)"
+            if deployed_at:
+                msg += f" | 배포 후 반영까지 {time.time() - deployed_at:.1f}초"
+            print(msg)
+            return elapsed
+
+        if time.time() - start + delay > timeout:
+            print(f"❌ [실패] {timeout}초가 지나도 {len(pending)}장이 반영되지 않았습니다.")
+            for url in pending:
+                print(f"   - {url}: {results.get(url)}")
+            return None
+
+        sample_url = next(iter(pending))
+        print(f"   ⏳ [대기] {len(pending)}장 미반영 (예: {sample_url.rsplit('/', 1)[-1]} {results[sample_url]})"
+              f"... {delay:.1f}초 뒤 재시도")
+        time.sleep(delay)
+        delay = min(delay * 1.5, MAX_DELAY)
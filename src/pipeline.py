@@ -0,0 +1,137 @@
+import asyncio
+import time
+import traceback
+
+from src import metrics
+
+# ============================================================================
+# 단계(Stage) 의존성 그래프 실행기
+# - 각 단계는 앞 단계 결과(dict)를 받아 실행되는 일반 함수입니다.
+# - 의존 단계가 모두 끝난 단계들은 asyncio 로 동시에 (스레드에서) 실행됩니다.
+# - 단계별 시작/종료 시각, 시도 횟수를 기록합니다.
+# - 실패한 단계만 다시 실행할 수 있습니다. (이미 끝난 단계 결과는 그대로 재사용)
+# ============================================================================
+class Stage:
+    def __init__(self, name, func, deps=(), label=None, retries=0, retry_delay=5):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.label = label or name
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+class PipelineError(Exception):
+    def __init__(self, stage, error, trace=""):
+        super().__init__(f"{stage.label}: {error}")
+        self.stage = stage
+        self.error = error
+        self.trace = trace
+
+class Pipeline:
+    def __init__(self, stages, on_stage_done=None):
+        self.on_stage_done = on_stage_done  # (단계이름, 결과) 콜백 - 체크포인트 저장용
+        self.stages = {stage.name: stage for stage in stages}
+        for stage in stages:
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"알 수 없는 의존 단계: {stage.name} -> {dep}")
+        self.results = {}
+        self.records = {name: {"status": "pending", "attempts": 0} for name in self.stages}
+        self._started_at = None
+
+    def mark_done(self, name, result=None):
+        """이전 실행에서 이미 끝난 단계로 표시합니다. (--resume)"""
+        self.results[name] = result
+        self.records[name].update(status="done", resumed=True)
+
+    # ------------------------------------------------------------------
+    def _ready(self, name):
+        return all(self.records[dep]["status"] == "done" for dep in self.stages[name].deps)
+
+    def _blocked(self, name):
+        return any(self.records[dep]["status"] in ("failed", "skipped") for dep in self.stages[name].deps)
+
+    async def _run_stage(self, stage):
+        record = self.records[stage.name]
+        record["status"] = "running"
+        record["start"] = time.time()
+        print(f"\n▶️ [{stage.label}] 시작...")
+
+        for attempt in range(stage.retries + 1):
+            record["attempts"] += 1
+            try:
+                upstream = {dep: self.results.get(dep) for dep in stage.deps}
+                self.results[stage.name] = await asyncio.to_thread(stage.func, upstream)
+                if self.on_stage_done:
+                    self.on_stage_done(stage.name, self.results[stage.name])
+                record["status"] = "done"
+                break
+            except Exception as e:
+                record["error"] = str(e)
+                record["trace"] = traceback.format_exc()
+                if attempt < stage.retries:
+                    print(f"   🔁 [{stage.label}] 실패 ({e}), {stage.retry_delay}초 뒤 재시도 ({attempt + 1}/{stage.retries})")
+                    await asyncio.sleep(stage.retry_delay)
+                else:
+                    record["status"] = "failed"
+
+        record["end"] = time.time()
+        metrics.record(f"stage.{stage.name}", record["start"], record["end"],
+                       status=record["status"], attempts=record["attempts"])
+        mark = "✅" if record["status"] == "done" else "❌"
+        print(f"{mark} [{stage.label}] {record['end'] - record['start']:.1f}초")
+
+    async def _run(self):
+        running = {}
+        while True:
+            for name in self.stages:
+                record = self.records[name]
+                if record["status"] != "pending" or name in running:
+                    continue
+                if self._blocked(name):
+                    record["status"] = "skipped"
+                elif self._ready(name):
+                    running[name] = asyncio.ensure_future(self._run_stage(self.stages[name]))
+            if not running:
+                break
+            done, _ = await asyncio.wait(running.values(), return_when=asyncio.FIRST_COMPLETED)
+            for name in [n for n, task in running.items() if task in done]:
+                running.pop(name)
+
+    def run(self):
+        """
+        아직 끝나지 않은 단계들을 실행합니다.
+        실패가 있으면 첫 번째 실패 단계로 PipelineError 를 던집니다.
+        같은 Pipeline 으로 run() 을 다시 부르면 실패/건너뛴 단계만 다시 실행합니다.
+        """
+        for record in self.records.values():
+            if record["status"] in ("failed", "skipped"):
+                record["status"] = "pending"
+        if self._started_at is None:
+            self._started_at = time.time()
+
+        asyncio.run(self._run())
+
+        failed = [name for name, r in self.records.items() if r["status"] == "failed"]
+        if failed:
+            first = min(failed, key=lambda n: self.records[n]["start"])
+            record = self.records[first]
+            raise PipelineError(self.stages[first], record.get("error"), record.get("trace", ""))
+        return self.results
+
+    def timeline(self):
+        """단계별 시작/종료 시각 (전체 시작 기준 초)"""
+        lines = []
+        base = self._started_at or time.time()
+        for name, record in sorted(self.records.items(), key=lambda kv: kv[1].get("start", float("inf"))):
+            label = self.stages[name].label
+            if record.get("resumed"):
+                lines.append(f"   - {label}: 이전 실행 결과 사용")
+                continue
+            if "start" not in record:
+                lines.append(f"   - {label}: {record['status']}")
+                continue
+            start = record["start"] - base
+            end = record.get("end", record["start"]) - base
+            lines.append(f"   - {label}: {start:6.1f}s → {end:6.1f}s ({record['status']}, 시도 {record['attempts']}회)")
+        return "⏱️ [단계별 실행 시간]\n" + "\n".join(lines)
@@ -0,0 +1,322 @@
+import os
+import re
+import sys
+import time
+import unicodedata
+from datetime import date
+
+from src import product_store, metrics
+
+# ============================================================================
+# 가격 이력 분석 (최저가 배지)
+# - 지난 기록(data/)에서 같은 상품을 찾아 날짜별 가격을 NumPy 배열로 모읍니다.
+#   같은 상품 판단: 정규화한 상품명 또는 이미지 URL 이 같으면 같은 상품
+# - 오늘 상품 전부의 역대 최저가 / 최근 N일 중앙값 / 중앙값 대비 할인율을 한 번에 계산
+# - 결과는 item["price_stats"] 로 붙어서 카드 이미지, 인스타 본문, 웹페이지 카드에 쓰입니다.
+#   (계산 결과라 상품 기록(data/, SQLite)에는 저장하지 않음 -> strip_stats)
+# - 만든 배열은 .cache/price_history.npz 에 저장하고, 저장된 기록(product_store)이 그대로면
+#   다음 실행에서 기록 JSON 을 읽지 않고 바로 불러옵니다.
+#
+#   python -m src.price_history [날짜]   : 저장된 기록으로 그 날짜(기본: 최신) 상품 분석 결과 출력
+# ============================================================================
+WINDOW_DAYS = int(os.environ.get("PRICE_WINDOW_DAYS", "30"))         # 중앙값을 볼 최근 기간
+MIN_SAMPLES = int(os.environ.get("PRICE_MIN_SAMPLES", "2"))          # 배지를 붙일 최소 과거 기록 수
+BADGE_DISCOUNT = float(os.environ.get("PRICE_BADGE_DISCOUNT", "10"))  # 평소 대비 몇 % 이상 싸면 배지
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_FILE = os.environ.get("PRICE_HISTORY_CACHE", os.path.join(BASE_DIR, ".cache", "price_history.npz"))
+CACHE_VERSION = 1   # build_arrays 결과 형식이 바뀌면 올림
+DERIVED_FIELDS = ("price_stats",)   # annotate 가 붙이는 필드 (저장하지 않음)
+
+_NON_WORD = re.compile(r"[\W_]+")
+# (scheme://호스트)(/thumbnails/remote/<크기>)(경로)(?쿼리) -> 경로만 (urlsplit 보다 몇 배 빠름)
+_IMAGE_PATH = re.compile(r"^(?:[a-z]+://[^/]*)?(?:/thumbnails/remote/[^/]+)?([^?#]*)")
+_IMAGE_PATHS = re.compile(r"^(?:[a-z]+://[^/\n]*)?(?:/thumbnails/remote/[^/\n]+)?([^?#\n]*).*$", re.MULTILINE)
+
+def normalize_name(name):
+    """대소문자/공백/기호 차이를 없앤 상품명 키"""
+    return _NON_WORD.sub("", unicodedata.normalize("NFKC", name or "").lower())
+
+def normalize_image_url(url):
+    """CDN 호스트(thumbnailN), 썸네일 크기 경로, 쿼리를 뺀 이미지 경로 키"""
+    if not url:
+        return ""
+    return _IMAGE_PATH.match(url).group(1)
+
+def _normalize_names(names):
+    return [normalize_name(name) for name in names]
+
+def _normalize_image_urls(urls):
+    # URL 이 기록 수만큼 많아서, 한 줄씩 이어 붙여 정규식 한 번으로 처리
+    if any("\n" in url for url in urls):
+        return [normalize_image_url(url) for url in urls]
+    return _IMAGE_PATHS.findall("\n".join(urls)) if urls else []
+
+def _intern(values):
+    """값 목록 -> (고유값 목록, 값별 번호 배열). 파이썬 반복 대신 dict/map (C 로 도는 부분) 사용"""
+    import numpy as np
+    keys = list(dict.fromkeys(values))
+    index = dict(zip(keys, range(len(keys))))
+    return keys, np.fromiter(map(index.__getitem__, values), dtype=np.int64, count=len(values))
+
+def _key_ids(values, normalize):
+    """원문 목록 -> (고유 정규화 키 목록, 원문별 키 번호 배열). 정규화는 고유 원문 수만큼만"""
+    raw, raw_ids = _intern(values)
+    keys, key_of_raw = _intern(normalize(raw))
+    return keys, key_of_raw[raw_ids]
+
+def _link_products(name_ids, image_ids, n_names, n_images):
+    """
+    기록 순서대로 봤을 때의 상품 번호 (예전 기록별 반복문과 같은 결과를 NumPy 로 한 번에)
+      - 이미 나온 상품명이면 그 상품
+      - 처음 나온 상품명인데 그 기록의 이미지가 앞에서 나왔으면 그 이미지의 상품
+    image_ids 가 -1 이면 이미지 없음. 반환: (이름별 상품 번호, 이미지별 상품 번호) - 0부터 빈틈없이
+    """
+    import numpy as np
+    _, first_of_name = np.unique(name_ids, return_index=True)
+    has_image = image_ids >= 0
+    image_rows = np.flatnonzero(has_image)
+    image_first = np.full(n_images, len(image_ids), dtype=np.int64)
+    _, first = np.unique(image_ids[has_image], return_index=True)
+    image_first[image_ids[image_rows[first]]] = image_rows[first]
+    owner = name_ids[np.minimum(image_first, len(name_ids) - 1)] if len(name_ids) else image_first
+
+    # 처음 나온 기록의 이미지가 그보다 앞에서 나왔으면, 그 이미지를 처음 쓴 이름을 부모로
+    parent = np.arange(n_names, dtype=np.int64)
+    first_image = image_ids[first_of_name]
+    linked = (first_image >= 0) & (image_first[np.maximum(first_image, 0)] < first_of_name)
+    parent[linked] = owner[first_image[linked]]
+    # 부모는 항상 더 먼저 나온 이름이라 몇 번만 건너뛰면 뿌리(최초 이름)에 닿음
+    while True:
+        grand = parent[parent]
+        if np.array_equal(grand, parent):
+            break
+        parent = grand
+
+    _, pid_of_name = np.unique(parent, return_inverse=True)
+    pid_of_name = pid_of_name.reshape(-1)
+    pid_of_image = pid_of_name[owner] if n_names else np.full(n_images, -1, dtype=np.int64)
+    return pid_of_name, pid_of_image
+
+def build_arrays(records, before=None):
+    """
+    기록(before 날짜 이전) -> 가격 이력 배열 dict (상품 번호, 날짜 순 정렬). .cache 에 그대로 저장할 수 있는 형태
+      pids / days / prices         : 기록별 상품 번호, 날짜 서수, 가격
+      name_keys / name_pids        : 정규화 상품명 -> 상품 번호
+      image_keys / image_pids      : 정규화 이미지 경로 -> 상품 번호
+    """
+    import numpy as np
+
+    # 10만 건 이상이라 열(column)별 리스트로 한 번에 꺼냄 (기록별 튜플보다 빠름)
+    valid = [item for item in records
+             if item.get('date') and (not before or item['date'] < before) and item.get('price') is not None]
+    date_col = [item['date'] for item in valid]
+    price_col = [item['price'] for item in valid]
+    name_col = [item.get('name') or "" for item in valid]
+    image_col = [item.get('image_url') or "" for item in valid]
+
+    # 원문 -> 고유값 번호 -> 정규화 키 -> 키 번호 (정규화는 고유 원문 수만큼만)
+    # (상품명은 같은 원문이 여러 날 반복, 이미지 URL 은 대부분 고유해서 바로 정규화)
+    name_keys, name_ids = _key_ids(name_col, _normalize_names)
+    image_keys, image_ids = _intern(_normalize_image_urls(image_col))
+    if "" in image_keys:
+        image_ids[image_ids == image_keys.index("")] = -1  # 이미지 없는 기록끼리는 묶지 않음
+    pid_of_name, pid_of_image = _link_products(name_ids, image_ids, len(name_keys), len(image_keys))
+
+    unique_dates, date_ids = _intern(date_col)
+    day_of_date = np.asarray([_day(d) for d in unique_dates], dtype=np.int32)
+
+    pids = pid_of_name[name_ids].astype(np.int32)
+    days = day_of_date[date_ids]
+    prices = np.asarray(price_col, dtype=np.int64)
+    order = np.lexsort((days, pids))
+    return {"pids": pids[order], "days": days[order], "prices": prices[order],
+            "name_keys": np.asarray(name_keys, dtype=str), "name_pids": pid_of_name,
+            "image_keys": np.asarray(image_keys, dtype=str), "image_pids": pid_of_image}
+
+def _day(date_str):
+    return date(int(date_str[:4]), int(date_str[4:6]), int(date_str[6:8])).toordinal()
+
+class PriceHistory:
+    """
+    before 날짜 이전 기록으로 만든 가격 이력.
+      pids / days / prices : (상품 번호, 날짜 서수) 순으로 정렬된 NumPy 배열
+    records 대신 build_arrays() 결과(arrays)를 넘기면 다시 계산하지 않습니다. (캐시)
+    """
+    def __init__(self, records=None, before=None, arrays=None):
+        import numpy as np
+
+        if arrays is None:
+            arrays = build_arrays(records or [], before)
+        self._day_cache = {}
+        self._by_name = dict(zip(arrays["name_keys"].tolist(), arrays["name_pids"].tolist()))
+        self._by_image = {key: pid for key, pid in zip(arrays["image_keys"].tolist(), arrays["image_pids"].tolist())
+                          if key and pid >= 0}
+        self.pids, self.days, self.prices = arrays["pids"], arrays["days"], arrays["prices"]
+        self.products = int(np.count_nonzero(self.pids[1:] != self.pids[:-1])) + 1 if len(self.pids) else 0
+
+    def _day(self, date_str):
+        day = self._day_cache.get(date_str)
+        if day is None:
+            day = self._day_cache[date_str] = _day(date_str)
+        return day
+
+    def identify(self, item):
+        """이력 속 상품 번호 (처음 보는 상품이면 -1)"""
+        pid = self._by_name.get(normalize_name(item.get('name')))
+        if pid is None:
+            image_key = normalize_image_url(item.get('image_url'))
+            pid = self._by_image.get(image_key, -1) if image_key else -1
+        return pid
+
+    def stats(self, items, today=None, window_days=WINDOW_DAYS):
+        """상품별 {low, median, samples, discount, badge} 목록 (items 순서)"""
+        import numpy as np
+
+        today = today or items[0]['date']
+        query = np.asarray([self.identify(item) for item in items], dtype=np.int32)
+        price = np.asarray([item['price'] for item in items], dtype=np.float64)
+
+        # 상품별 과거 기록 구간 (pids 가 정렬돼 있어서 이진 탐색)
+        starts = np.searchsorted(self.pids, query, side="left")
+        counts = np.searchsorted(self.pids, query, side="right") - starts
+        found = (query >= 0) & (counts > 0)
+
+        # 역대 최저가: 전체 상품의 구간별 최솟값을 한 번에 (reduceat) 구한 뒤 오늘 상품만 골라냄
+        low = np.full(len(items), np.nan)
+        if found.any():
+            group_starts = np.flatnonzero(np.r_[True, self.pids[1:] != self.pids[:-1]])
+            group_low = np.minimum.reduceat(self.prices, group_starts)
+            low[found] = group_low[np.searchsorted(self.pids[group_starts], query[found])]
+
+        # 최근 window_days 일 중앙값: 기간 안 기록을 (상품, 가격) 순 정렬 후 가운데 값
+        median = np.full(len(items), np.nan)
+        in_window = self.days >= self._day(today) - window_days
+        w_pids, w_prices = self.pids[in_window], self.prices[in_window]
+        if len(w_pids):
+            order = np.lexsort((w_prices, w_pids))
+            w_pids, w_prices = w_pids[order], w_prices[order]
+            w_starts = np.searchsorted(w_pids, query, side="left")
+            w_counts = np.searchsorted(w_pids, query, side="right") - w_starts
+            has = (query >= 0) & (w_counts > 0)
+            lo = w_prices[w_starts[has] + (w_counts[has] - 1) // 2]
+            hi = w_prices[w_starts[has] + w_counts[has] // 2]
+            median[has] = (lo + hi) / 2
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            discount = np.where(median > 0, (median - price) / median * 100, np.nan)
+
+        result = []
+        for i in range(len(items)):
+            samples = int(counts[i]) if found[i] else 0
+            entry = {"samples": samples,
+                     "low": None if np.isnan(low[i]) else int(low[i]),
+                     "median": None if np.isnan(median[i]) else int(round(median[i])),
+                     "discount": None if np.isnan(discount[i]) else round(float(discount[i]), 1)}
+            entry["badge"] = badge(price[i], entry)
+            result.append(entry)
+        return result
+
+def badge(price, entry):
+    """카드/본문/웹페이지에 붙일 짧은 문구 (없으면 None)"""
+    if entry["samples"] < MIN_SAMPLES:
+        return None
+    if entry["low"] is not None and price <= entry["low"]:
+        return "역대 최저가"
+    if entry["discount"] is not None and entry["discount"] >= BADGE_DISCOUNT:
+        return f"평소보다 {entry['discount']:.0f}% 저렴"
+    return None
+
+def _read_cache(key):
+    import numpy as np
+    try:
+        with np.load(CACHE_FILE, allow_pickle=False) as data:
+            if str(data["key"]) != key:
+                return None
+            return {name: data[name] for name in data.files if name != "key"}
+    except (OSError, KeyError, ValueError):
+        return None
+
+def _write_cache(key, arrays):
+    import numpy as np
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        tmp_path = CACHE_FILE + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, key=np.asarray(key), **arrays)
+        os.replace(tmp_path, CACHE_FILE)
+    except OSError as e:
+        print(f"⚠️ 가격 이력 캐시 저장 실패 (다음에 다시 계산): {e}")
+
+def _cache_key():
+    return f"{CACHE_VERSION}:{product_store.fingerprint()}"
+
+def refresh_cache(records):
+    """저장된 전체 기록(product_store.load_all() 결과)으로 캐시를 미리 만듭니다. (DB 저장 직후)"""
+    _write_cache(_cache_key(), build_arrays(records))
+
+def load_history(before=None):
+    """
+    저장된 기록의 가격 이력. 반환: (PriceHistory, 캐시 사용 여부)
+    캐시는 전체 기록으로 만든 배열이라 before 이후 기록이 없을 때(평소 실행)만 그대로 씁니다.
+    """
+    key = _cache_key()
+    arrays = _read_cache(key)
+    if arrays is not None and (not before or not len(arrays["days"]) or arrays["days"].max() < _day(before)):
+        metrics.count("price_history.cache_hit")
+        return PriceHistory(arrays=arrays), True
+
+    metrics.count("price_history.cache_miss")
+    records = product_store.load_all()
+    if arrays is None and (not before or all(item.get('date', '') < before for item in records)):
+        arrays = build_arrays(records)
+        _write_cache(key, arrays)
+        return PriceHistory(arrays=arrays), False
+    return PriceHistory(records, before=before), False
+
+def annotate(items, records=None):
+    """
+    오늘 상품들에 item["price_stats"] 를 붙입니다. (records 없으면 저장된 전체 기록 사용)
+    반환: 배지가 붙은 상품 수
+    """
+    if not items:
+        return 0
+    today = items[0]['date']
+    start = time.perf_counter()
+    with metrics.span("price_history.annotate", items=len(items)) as attrs:
+        if records is None:
+            history, cached = load_history(before=today)
+        else:
+            history, cached = PriceHistory(records, before=today), False
+        for item, entry in zip(items, history.stats(items, today)):
+            item['price_stats'] = entry
+        badges = sum(1 for item in items if item['price_stats']['badge'])
+        attrs.update(observations=len(history.prices), badges=badges, cached=cached)
+    print(f"📉 [가격 이력] 과거 기록 {len(history.prices)}건 / 상품 {history.products}개{' (캐시)' if cached else ''} | "
+          f"배지 {badges}개 | ⏱️ {time.perf_counter() - start:.2f}초")
+    return badges
+
+def price_badge(item):
+    return (item.get('price_stats') or {}).get('badge')
+
+def strip_stats(items):
+    """저장용 사본: 분석 결과는 원본 기록에 남기지 않음 (기록이 커지고 매일 diff 가 생김)"""
+    return [{key: value for key, value in item.items() if key not in DERIVED_FIELDS} for item in items]
+
+def badges_by_id(items):
+    """{상품 id: 배지}. price_stats 가 없는 기록(저장본에서 읽은 경우)이면 다시 계산"""
+    if items and not any('price_stats' in item for item in items):
+        items = [dict(item) for item in items]
+        annotate(items)
+    return {item['id']: price_badge(item) for item in items if price_badge(item)}
+
+if __name__ == "__main__":
+    records = product_store.load_all()
+    if not records:
+        sys.exit("저장된 기록이 없습니다.")
+    date_str = sys.argv[1] if len(sys.argv) > 1 else records[0]['date']
+    items = sorted((dict(item) for item in records if item['date'] == date_str), key=lambda item: item['rank'])
+    annotate(items, records)
+    for item in items:
+        s = item['price_stats']
+        print(f"   {item['rank']:>2}위 {item['price']:>9,}원 | 최저 {s['low'] or '-':>9} | 중앙값 {s['median'] or '-':>9} | "
+              f"기록 {s['samples']:>3}건 | {price_badge(item) or ''}  {item['name'][:30]}")
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import sys
+
+# ============================================================================
+# 상품 저장소 (날짜별 파티션 + 매니페스트)
+#
+#   data/products.json        : 압축(compact)된 전체 기록 (최신 날짜가 위)
+#   data/daily/YYYYMMDD.json  : 마지막 압축 이후 추가된 날짜별 기록
+#   data/manifest.json        : 파티션 목록과 건수
+#
+# 매일 실행 시에는 오늘 파티션 1개와 매니페스트만 씁니다. (전체 재작성 X)
+# 같은 날짜를 다시 저장하면 그 날짜 파티션을 통째로 덮어씁니다.
+# ============================================================================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+BASE_FILE = os.path.join(DATA_DIR, "products.json")
+PARTITION_DIR = os.path.join(DATA_DIR, "daily")
+MANIFEST_FILE = os.path.join(DATA_DIR, "manifest.json")
+
+def _read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        print(f"⚠️ {os.path.basename(path)} 파일이 깨져있어 무시합니다.")
+        return default
+
+def _write_json(path, data, indent=4):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def _partition_path(date_str):
+    return os.path.join(PARTITION_DIR, f"{date_str}.json")
+
+def load_manifest():
+    manifest = _read_json(MANIFEST_FILE, {})
+    manifest.setdefault("partitions", {})
+    return manifest
+
+def save_day(new_items):
+    """오늘(같은 날짜) 상품들만 파티션 파일로 저장합니다."""
+    date_str = new_items[0]['date']
+    _write_json(_partition_path(date_str), new_items)
+
+    manifest = load_manifest()
+    manifest["partitions"][date_str] = len(new_items)
+    manifest["partitions"] = dict(sorted(manifest["partitions"].items(), reverse=True))
+    _write_json(MANIFEST_FILE, manifest, indent=2)
+    return date_str
+
+def load_all():
+    """압축본 + 파티션을 합쳐 전체 기록을 돌려줍니다. (최신 날짜가 위)"""
+    manifest = load_manifest()
+    partition_dates = set(manifest["partitions"])
+
+    partition_items = []
+    for date_str in sorted(partition_dates, reverse=True):
+        partition_items += _read_json(_partition_path(date_str), [])
+
+    # 파티션에 있는 날짜는 압축본보다 파티션이 우선 (같은 날 덮어쓰기)
+    base_items = [item for item in _read_json(BASE_FILE, [])
+                  if item.get('date') not in partition_dates]
+
+    merged = partition_items + base_items
+    # 날짜 역순 정렬 (안정 정렬이라 같은 날짜 안의 순서는 유지됨)
+    merged.sort(key=lambda item: item.get('date', ''), reverse=True)
+    return merged
+
+def fingerprint():
+    """
+    저장된 기록이 바뀌었는지 판단하는 해시 (매니페스트 내용 + 압축본/파티션 파일 크기와 수정 시각)
+    파일을 읽지 않고 stat 만 하므로 가볍습니다. (분석 결과 캐시 키용)
+    """
+    manifest = load_manifest()
+    stats = []
+    for path in [BASE_FILE] + [_partition_path(d) for d in sorted(manifest["partitions"])]:
+        try:
+            st = os.stat(path)
+            stats.append([os.path.basename(path), st.st_size, st.st_mtime_ns])
+        except OSError:
+            stats.append([os.path.basename(path), None, None])
+    payload = json.dumps([manifest, stats], sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def compact():
+    """파티션들을 products.json 하나로 합치고 파티션을 정리합니다."""
+    manifest = load_manifest()
+    all_data = load_all()
+    _write_json(BASE_FILE, all_data)
+
+    partition_count = len(manifest["partitions"])
+    for date_str in manifest["partitions"]:
+        path = _partition_path(date_str)
+        if os.path.exists(path):
+            os.remove(path)
+    manifest["partitions"] = {}
+    _write_json(MANIFEST_FILE, manifest, indent=2)
+
+    print(f"🗜️ [압축 완료] 파티션 {partition_count}개 정리, 총 {len(all_data)}개 상품")
+    return len(all_data)
+
+def prune(before_date, dry_run=False):
+    """
+    before_date(YYYYMMDD) 보다 오래된 기록을 지웁니다. (보존 정책용)
+    반환: (지운 날짜 목록, 지운 상품 수, 바뀐/지운 파일 경로 목록)
+    """
+    manifest = load_manifest()
+    base_items = _read_json(BASE_FILE, [])
+    kept = [item for item in base_items if item.get('date', '') >= before_date]
+    old_partitions = [d for d in manifest["partitions"] if d < before_date]
+
+    dates = {item.get('date') for item in base_items if item.get('date', '') < before_date} | set(old_partitions)
+    removed_count = len(base_items) - len(kept) + sum(manifest["partitions"][d] for d in old_partitions)
+    paths = [_partition_path(d) for d in old_partitions]
+    if len(kept) != len(base_items):
+        paths.append(BASE_FILE)
+    if old_partitions:
+        paths.append(MANIFEST_FILE)
+
+    if not dry_run:
+        if len(kept) != len(base_items):
+            _write_json(BASE_FILE, kept)
+        for date_str in old_partitions:
+            path = _partition_path(date_str)
+            if os.path.exists(path):
+                os.remove(path)
+            del manifest["partitions"][date_str]
+        if old_partitions:
+            _write_json(MANIFEST_FILE, manifest, indent=2)
+    return sorted(dates), removed_count, paths
+
+if __name__ == "__main__":
+    # 사용법: python -m src.product_store compact
+    if len(sys.argv) > 1 and sys.argv[1] == "compact":
+        compact()
+    else:
+        print("사용법: python -m src.product_store compact")
@@ -0,0 +1,51 @@
+import os
+import threading
+import time
+
+from src import metrics
+
+# ============================================================================
+# 토큰 버킷 요청 속도 제한
+# - 초당 rate 개씩 토큰이 차고 최대 capacity 개까지 모입니다. 요청 하나에 토큰 하나.
+# - 토큰이 없으면 다음 토큰이 찰 때까지 기다립니다. (여러 스레드가 같이 써도 안전)
+# - 쿠팡 파트너스 API 처럼 분당 호출 수 제한이 있는 곳에 미리 맞춰서 429 를 피합니다.
+# ============================================================================
+class TokenBucket:
+    def __init__(self, rate, capacity=None, name="rate"):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self.name = name
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens=1):
+        """토큰을 가져갑니다 (필요하면 기다림). 반환: 기다린 시간(초)"""
+        if self.rate <= 0:
+            return 0.0  # 0 이면 제한 없음
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    break
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+        if waited:
+            with self._lock:
+                self.waited += waited
+            metrics.count(f"{self.name}.throttled")
+        return waited
+
+def from_env(prefix, per_minute, burst):
+    """<prefix>_RATE_PER_MIN / <prefix>_BURST 환경변수로 조절 가능한 버킷 (0 이면 제한 없음)"""
+    per_minute = float(os.environ.get(f"{prefix}_RATE_PER_MIN", per_minute))
+    burst = float(os.environ.get(f"{prefix}_BURST", burst))
+    return TokenBucket(per_minute / 60.0, burst, name=prefix.lower())
@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+# ============================================================================
+# 날짜별 실행 기록 (.cache/runs/<날짜>.json)
+# - 단계별 완료 여부와 결과물(수집 상품, 이미지 해시, 배포 커밋, 인스타 컨테이너 ID)을 남겨
+#   `python main.py --resume` 로 다시 돌릴 때 끝난 단계를 건너뜁니다.
+# - 사이트에 배포되지 않는 .cache 에 두고, 워크플로가 실패한 실행 뒤에도 캐시로 저장합니다.
+#   (배포 이후 단계인 웹반영확인/인스타 기록도 다음 --resume 실행에 남음)
+# - 예전 위치(images/<날짜>/run_manifest.json)에 기록이 있으면 읽어오고, 저장할 때 지웁니다.
+# ============================================================================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGES_DIR = os.path.join(BASE_DIR, "images")
+RUNS_DIR = os.environ.get("RUN_MANIFEST_DIR", os.path.join(BASE_DIR, ".cache", "runs"))
+LEGACY_NAME = "run_manifest.json"
+
+def today_kst():
+    # fetch_data 와 같은 방식으로 한국 날짜 계산
+    return (datetime.utcnow() + timedelta(hours=9)).strftime("%Y%m%d")
+
+def hash_file(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def hash_images(date_str):
+    """images/<날짜>/ 의 jpg 파일별 sha256"""
+    folder = os.path.join(IMAGES_DIR, date_str)
+    if not os.path.isdir(folder):
+        return {}
+    return {entry.name: hash_file(entry.path)
+            for entry in sorted(os.scandir(folder), key=lambda e: e.name)
+            if entry.name.endswith(".jpg")}
+
+class RunManifest:
+    def __init__(self, date_str):
+        self.date = date_str
+        self.path = os.path.join(RUNS_DIR, f"{date_str}.json")
+        self.legacy_path = os.path.join(IMAGES_DIR, date_str, LEGACY_NAME)
+        self._lock = threading.Lock()
+        self.data = {"date": date_str, "stages": {}, "items": None, "images": {},
+                     "deploy": {}, "instagram": {}}
+        source = self.path if os.path.exists(self.path) else self.legacy_path
+        if os.path.exists(source):
+            try:
+                with open(source, "r", encoding="utf-8") as f:
+                    self.data.update(json.load(f))
+            except json.JSONDecodeError:
+                print(f"⚠️ 실행 기록이 깨져있어 새로 시작합니다. ({source})")
+
+    def reset(self):
+        """새 실행: 이전 기록을 비웁니다."""
+        with self._lock:
+            self.data = {"date": self.date, "stages": {}, "items": None, "images": {},
+                         "deploy": {}, "instagram": {}}
+
+    def is_done(self, stage):
+        return self.data["stages"].get(stage, {}).get("status") == "done"
+
+    def mark_done(self, stage, **fields):
+        with self._lock:
+            self.data["stages"][stage] = {"status": "done", "finished_at": time.strftime("%Y-%m-%d %H:%M:%S")}
+            self.data.update(fields)
+        self.save()
+
+    def images_intact(self):
+        """기록된 이미지가 모두 있고 내용도 같은지"""
+        recorded = self.data.get("images") or {}
+        return bool(recorded) and hash_images(self.date) == recorded
+
+    def save(self):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            # 예전 위치의 기록은 옮겼으니 삭제 (다음 배포 커밋에서 사이트에서도 빠짐)
+            if os.path.exists(self.legacy_path):
+                os.remove(self.legacy_path)
@@ -0,0 +1,200 @@
+import json
+import os
+import sqlite3
+import sys
+
+from src import product_store
+
+# ============================================================================
+# SQLite 상품 인덱스 (선택 사항)
+# - 환경변수 PRODUCT_DB=sqlite 일 때 update_db 가 함께 사용합니다.
+# - 원본 기록은 여전히 data/ 의 JSON (깃에 남는 기록) 이고,
+#   DB 파일은 언제든 `python -m src.sqlite_store import` 로 다시 만들 수 있습니다.
+# ============================================================================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_FILE = os.environ.get("SQLITE_DB_PATH", os.path.join(BASE_DIR, ".cache", "products.db"))
+
+COLUMNS = ["id", "date", "rank", "name", "price", "image_url", "link"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    price INTEGER NOT NULL,
+    image_url TEXT,
+    link TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_products_date ON products(date);
+CREATE INDEX IF NOT EXISTS idx_products_date_rank ON products(date, rank);
+CREATE INDEX IF NOT EXISTS idx_products_name ON products(name);
+
+CREATE TRIGGER IF NOT EXISTS products_ai AFTER INSERT ON products BEGIN
+    INSERT INTO products_fts(rowid, name) VALUES (new.rowid, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS products_ad AFTER DELETE ON products BEGIN
+    INSERT INTO products_fts(products_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+END;
+"""
+
+def _create_fts(conn):
+    # 한글 부분검색을 위해 trigram 토크나이저 우선 (SQLite 3.34+), 없으면 기본값
+    try:
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5("
+                     "name, content='products', content_rowid='rowid', tokenize='trigram')")
+    except sqlite3.OperationalError:
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5("
+                     "name, content='products', content_rowid='rowid')")
+
+def connect(path=None):
+    path = path or DB_FILE
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    _create_fts(conn)
+    conn.executescript(SCHEMA)
+    return conn
+
+def _to_row(item):
+    extra = {k: v for k, v in item.items() if k not in COLUMNS}
+    return (item['id'], item['date'], item['rank'], item['name'], int(item['price']),
+            item.get('image_url'), item.get('link'), json.dumps(extra, ensure_ascii=False) if extra else None)
+
+def _to_item(row):
+    item = {col: row[col] for col in COLUMNS}
+    if row["extra"]:
+        item.update(json.loads(row["extra"]))
+    return item
+
+def _insert(conn, items, replace=True):
+    # INSERT OR REPLACE 는 삭제 트리거가 안 불려서 FTS 가 어긋나므로 직접 지우고 넣습니다
+    if replace:
+        conn.executemany("DELETE FROM products WHERE id = ?", [(item['id'],) for item in items])
+    conn.executemany("INSERT INTO products VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                     [_to_row(item) for item in items])
+
+# ============================================================================
+# 쓰기
+# ============================================================================
+def upsert_day(items, conn=None):
+    """해당 날짜 기록을 통째로 교체합니다. (같은 날 덮어쓰기)"""
+    own = conn is None
+    conn = conn or connect()
+    with conn:
+        conn.execute("DELETE FROM products WHERE date = ?", (items[0]['date'],))
+        _insert(conn, items)
+    if own: conn.close()
+
+def delete_before(date_str, conn=None):
+    """date_str 보다 오래된 기록을 지웁니다. (보존 정책용) 반환: 지운 행 수"""
+    own = conn is None
+    conn = conn or connect()
+    with conn:
+        deleted = conn.execute("DELETE FROM products WHERE date < ?", (date_str,)).rowcount
+    if own: conn.close()
+    return deleted
+
+def import_json(items=None, conn=None):
+    """JSON 기록(기본: product_store 전체)을 DB로 새로 가져옵니다."""
+    items = product_store.load_all() if items is None else items
+    own = conn is None
+    conn = conn or connect()
+    # 대량 입력은 행 단위 FTS 트리거보다 마지막에 한 번 rebuild 하는 편이 훨씬 빠름
+    conn.execute("DROP TRIGGER IF EXISTS products_ai")
+    with conn:
+        conn.execute("DELETE FROM products")
+        # 중복 id 는 나중 것(= 오래된 기록)보다 먼저 나온 최신 기록을 남깁니다
+        unique = list({item['id']: item for item in reversed(items)}.values())
+        _insert(conn, unique, replace=False)
+        conn.execute("INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+    conn.executescript(SCHEMA)
+    if own: conn.close()
+    print(f"📥 [SQLite] {len(unique)}개 상품 가져오기 완료 ({DB_FILE})")
+    return len(unique)
+
+def export_json(path=None, conn=None):
+    """DB 내용을 products.json 형식(최신 날짜가 위)으로 내보냅니다."""
+    path = path or product_store.BASE_FILE
+    data = load_all(conn)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+    print(f"📤 [SQLite] {len(data)}개 상품 내보내기 완료 ({path})")
+    return len(data)
+
+# ============================================================================
+# 조회
+# ============================================================================
+def _query(sql, params=(), conn=None):
+    own = conn is None
+    conn = conn or connect()
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        if own: conn.close()
+
+def count(conn=None):
+    return _query("SELECT COUNT(*) AS n FROM products", conn=conn)[0]["n"]
+
+def load_all(conn=None):
+    rows = _query("SELECT * FROM products ORDER BY date DESC, rank ASC", conn=conn)
+    return [_to_item(row) for row in rows]
+
+def latest_date(conn=None):
+    return _query("SELECT MAX(date) AS d FROM products", conn=conn)[0]["d"]
+
+def dates(conn=None):
+    return [row["date"] for row in _query("SELECT DISTINCT date FROM products ORDER BY date DESC", conn=conn)]
+
+def items_for_date(date_str, conn=None):
+    rows = _query("SELECT * FROM products WHERE date = ? ORDER BY rank", (date_str,), conn=conn)
+    return [_to_item(row) for row in rows]
+
+def search(keyword, limit=100, conn=None):
+    """상품명 전문검색 (trigram 이라 3글자 미만은 LIKE 로 대체)"""
+    keyword = keyword.strip()
+    if len(keyword) >= 3:
+        phrase = '"' + keyword.replace('"', '""') + '"'
+        sql = ("SELECT p.* FROM products_fts f JOIN products p ON p.rowid = f.rowid "
+               "WHERE products_fts MATCH ? ORDER BY p.date DESC, p.rank LIMIT ?")
+        try:
+            return [_to_item(row) for row in _query(sql, (phrase, limit), conn=conn)]
+        except sqlite3.OperationalError:
+            pass
+    sql = "SELECT * FROM products WHERE name LIKE ? ORDER BY date DESC, rank LIMIT ?"
+    return [_to_item(row) for row in _query(sql, (f"%{keyword}%", limit), conn=conn)]
+
+def price_history(name, conn=None):
+    """같은 상품명이 등장한 모든 날짜와 가격 [(date, rank, price), ...] (오래된 순)"""
+    rows = _query("SELECT date, rank, price FROM products WHERE name = ? ORDER BY date",
+                  (name,), conn=conn)
+    return [(row["date"], row["rank"], row["price"]) for row in rows]
+
+def ensure_ready(conn=None):
+    """DB가 비어 있으면 JSON 기록에서 자동으로 채웁니다."""
+    if count(conn) == 0:
+        import_json(conn=conn)
+
+if __name__ == "__main__":
+    # 사용법:
+    #   python -m src.sqlite_store import
+    #   python -m src.sqlite_store export [경로]
+    #   python -m src.sqlite_store search 코카콜라
+    #   python -m src.sqlite_store history "코카콜라 제로"
+    cmd = sys.argv[1] if len(sys.argv) > 1 else ""
+    arg = sys.argv[2] if len(sys.argv) > 2 else None
+    if cmd == "import":
+        import_json()
+    elif cmd == "export":
+        export_json(arg)
+    elif cmd == "search" and arg:
+        for item in search(arg):
+            print(f"{item['date']} {item['rank']:>2}위 {item['price']:>8,}원  {item['name']}")
+    elif cmd == "history" and arg:
+        for date_str, rank, price in price_history(arg):
+            print(f"{date_str} {rank:>2}위 {price:>8,}원")
+    else:
+        print("사용법: python -m src.sqlite_store [import | export [경로] | search 키워드 | history 상품명]")
@@ -0,0 +1,42 @@
+import os
+import re
+
+# ============================================================================
+# 아주 작은 HTML 템플릿 엔진
+# - templates/ 폴더의 파일에서 {{ 이름 }} 자리만 채워 넣습니다.
+# - 파일을 처음 읽을 때 고정 문자열/자리표시 목록으로 미리 쪼개두고(컴파일),
+#   파일이 바뀌지 않는 한 다시 파싱하지 않습니다.
+# ============================================================================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_DIR = os.path.join(BASE_DIR, "templates")
+
+_PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+_compiled = {}
+
+class Template:
+    def __init__(self, source):
+        self.source = source
+        # 짝수 칸: 고정 문자열, 홀수 칸: 자리표시 이름
+        self.parts = _PLACEHOLDER.split(source)
+        self.names = set(self.parts[1::2])
+
+    def render(self, **context):
+        missing = self.names - set(context)
+        if missing:
+            raise KeyError(f"템플릿 값 누락: {', '.join(sorted(missing))}")
+        out = list(self.parts)
+        for i in range(1, len(out), 2):
+            out[i] = str(context[out[i]])
+        return "".join(out)
+
+def get_template(name):
+    """templates/<name> 을 컴파일해서 돌려줍니다. (수정 시각이 같으면 캐시 사용)"""
+    path = os.path.join(TEMPLATE_DIR, name)
+    mtime = os.path.getmtime(path)
+    cached = _compiled.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, "r", encoding="utf-8") as f:
+        template = Template(f.read())
+    _compiled[path] = (mtime, template)
+    return template
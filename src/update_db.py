@@ -1,251 +1,297 @@
 import json
 import os
+import hashlib
 from datetime import datetime
 
+from src import product_store, sqlite_store, optimize_image, price_history, cleanup
+from src.template import get_template
+
 # 데이터 저장 경로 (프로젝트 루트의 data 폴더)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATA_FILE = os.path.join(BASE_DIR, "data", "products.json")
+DATA_FILE = product_store.BASE_FILE
 # HTML 파일은 루트에 저장 (github pages가 인식하도록)
 HTML_FILE = os.path.join(BASE_DIR, "index.html")
+# PRODUCT_DB=sqlite 이면 SQLite 인덱스도 함께 갱신하고 화면 생성도 DB에서 읽습니다
+USE_SQLITE = os.environ.get("PRODUCT_DB", "json").lower() == "sqlite"
+# 지난 날짜 데이터는 월별 조각(shard)으로 나눠 페이지가 필요할 때만 받아갑니다
+ARCHIVE_DIR = os.path.join(BASE_DIR, "data", "archive")
+ARCHIVE_MANIFEST = os.path.join(ARCHIVE_DIR, "dates.json")
+# 조각 파일에 넣는 필드 (지난 날짜 카드는 images/ 폴더 이미지를 쓰므로 image_url 은 제외)
+ARCHIVE_FIELDS = ["id", "date", "rank", "name", "price", "link"]
+# 검색용 2글자(bigram) 역색인 (data/search/NN.json) - 조각 수는 페이지 JS 와 같아야 함
+SEARCH_DIR = os.path.join(BASE_DIR, "data", "search")
+SEARCH_SHARDS = 64
+
+def _short_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:10]
+
+class ArtifactWriter:
+    """
+    웹사이트 산출물 쓰기 도우미
+    - 내용이 같으면 쓰지 않습니다. (깃 변경 최소화)
+    - dry_run 이면 실제로 쓰지 않고 바뀔 파일 목록만 모읍니다.
+    """
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.changed = []
+        self.removed = []
+        self.unchanged = 0
+
+    def write(self, path, content):
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                if f.read() == content:
+                    self.unchanged += 1
+                    return False
+        self.changed.append(path)
+        if not self.dry_run:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+        return True
+
+    def remove(self, path):
+        self.removed.append(path)
+        if not self.dry_run:
+            os.remove(path)
+
+    def report(self):
+        label = "변경 예정" if self.dry_run else "변경"
+        print(f"   📝 [산출물] {label} {len(self.changed)}개, 삭제 {len(self.removed)}개, 그대로 {self.unchanged}개")
+        if self.dry_run:
+            for path in self.changed:
+                print(f"      ~ {os.path.relpath(path, BASE_DIR)}")
+            for path in self.removed:
+                print(f"      - {os.path.relpath(path, BASE_DIR)}")
+
+# ============================================================================
+# 검색 색인
+# - 상품명/번호를 소문자로 바꿔 단어별 2글자 조각(bigram)으로 나눕니다 (한글도 그대로 동작)
+# - 상품 번호 "20251209-01" 은 숫자 2025120901 로 저장하고, 정렬 후 차이값(delta)으로 압축
+# - bigram 해시로 SEARCH_SHARDS 개 파일에 나눠서, 검색어에 필요한 조각만 받게 합니다
+# ============================================================================
+def _bigrams(text):
+    grams = set()
+    for word in text.lower().split():
+        chars = list(word)
+        for i in range(len(chars) - 1):
+            grams.add(chars[i] + chars[i + 1])
+    return grams
+
+def _bigram_shard(gram):
+    # 페이지 JS 의 bigramShard() 와 같은 계산
+    return (ord(gram[0]) * 31 + ord(gram[1])) % SEARCH_SHARDS
+
+def _doc_number(item):
+    return int(item['date']) * 100 + int(item['rank'])
+
+def write_search_index(data, writer):
+    """검색 색인 조각을 쓰고 {조각번호: 해시} 를 돌려줍니다. (바뀐 조각만 씀)"""
+    postings = {}
+    for item in data:
+        doc = _doc_number(item)
+        for gram in _bigrams(item['name']) | _bigrams(item['id']):
+            postings.setdefault(gram, set()).add(doc)
+
+    shards = [{} for _ in range(SEARCH_SHARDS)]
+    for gram, docs in postings.items():
+        docs = sorted(docs)
+        deltas = [docs[0]] + [b - a for a, b in zip(docs, docs[1:])]
+        shards[_bigram_shard(gram)][gram] = deltas
+
+    versions = {}
+    written = 0
+    for number, shard in enumerate(shards):
+        # 한 줄에 bigram 하나씩 -> 깃 diff 가 작게 나옵니다
+        lines = [json.dumps(gram, ensure_ascii=False) + ":" + json.dumps(shard[gram], separators=(",", ":"))
+                 for gram in sorted(shard)]
+        content = "{\n" + ",\n".join(lines) + "\n}\n"
+        versions[f"{number:02d}"] = _short_hash(content)
+        if writer.write(os.path.join(SEARCH_DIR, f"{number:02d}.json"), content):
+            written += 1
+
+    print(f"   - 검색 색인: bigram {len(postings)}개, 조각 {SEARCH_SHARDS}개 중 {written}개 갱신")
+    return versions
+
+def _read_archive_manifest():
+    try:
+        with open(ARCHIVE_MANIFEST, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def write_archive_shards(data, writer, search_versions=None, changed_dates=None):
+    """
+    전체 기록을 월별 조각(data/archive/YYYYMM.json)과 날짜 목록(dates.json)으로 씁니다.
+    바뀐 조각만 디스크에 쓰고, 목록의 해시값으로 브라우저 캐시를 무효화합니다.
+    changed_dates 를 주면 그 날짜가 속한 달만 다시 직렬화합니다. (나머지는 기존 해시 사용)
+    """
+    months = {}
+    for item in data:
+        months.setdefault(item['date'][:6], []).append(item)
+
+    old_shards = _read_archive_manifest().get("shards", {}) if changed_dates is not None else {}
+    dirty_months = {date[:6] for date in (changed_dates or [])}
+
+    shards = {}
+    rebuilt = 0
+    for month, items in months.items():
+        path = os.path.join(ARCHIVE_DIR, f"{month}.json")
+        if month not in dirty_months and month in old_shards and os.path.exists(path):
+            shards[month] = old_shards[month]
+            continue
+        records = [{key: item[key] for key in ARCHIVE_FIELDS if key in item} for item in items]
+        records.sort(key=lambda r: (r['date'], r['rank']))
+        content = json.dumps(records, ensure_ascii=False, separators=(",", ":"))
+        shards[month] = _short_hash(content)
+        writer.write(path, content)
+        rebuilt += 1
+
+    # 더 이상 기록이 없는 달의 조각은 삭제
+    if os.path.isdir(ARCHIVE_DIR):
+        for entry in os.scandir(ARCHIVE_DIR):
+            name = entry.name[:-5]
+            if entry.name.endswith(".json") and name.isdigit() and name not in months:
+                writer.remove(entry.path)
+
+    dates = sorted({item['date'] for item in data}, reverse=True)
+    manifest = json.dumps({"dates": dates, "shards": dict(sorted(shards.items())),
+                           "search": search_versions or {}},
+                          ensure_ascii=False, separators=(",", ":"))
+    writer.write(ARCHIVE_MANIFEST, manifest)
+    print(f"   - 지난 기록 조각: {len(shards)}개 중 {rebuilt}개 다시 생성")
+    return _short_hash(manifest)
 
-def save_to_json(new_items):
+def save_to_json(new_items, dry_run=False, pruned_dates=()):
+    """pruned_dates: 보존 정책으로 기록을 지운 날짜 (해당 달 조각도 다시 생성)"""
     if not new_items:
         print("❌ 저장할 데이터가 없습니다.")
         return
 
-    print(f"\n💾 데이터베이스 저장 시작 ({DATA_FILE})...")
-
-    # 1. 기존 데이터 불러오기
-    all_data = []
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                all_data = json.load(f)
-        except json.JSONDecodeError:
-            print("⚠️ 기존 파일이 깨져있어 새로 만듭니다.")
-            all_data = []
-    
-    # 2. 중복 방지 로직 (선생님 기존 방식 유지)
-    # 오늘 날짜 데이터가 이미 있다면 삭제 (덮어쓰기 위함)
+    print(f"\n💾 데이터베이스 저장 시작 ({DATA_FILE}){' [DRY-RUN]' if dry_run else ''}...")
     today_str = new_items[0]['date']
-    all_data = [item for item in all_data if item.get('date') != today_str]
-    
-    # 3. 새 데이터 추가 (최신 날짜가 위로 오게)
-    updated_data = new_items + all_data 
-    
-    # 4. JSON 파일로 저장
-    os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
-    
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(updated_data, f, indent=4, ensure_ascii=False)
-        
+    # 가격 배지는 화면에만 쓰고, 기록에는 수집한 필드만 저장
+    badges = price_history.badges_by_id(new_items) if any('price_stats' in item for item in new_items) else {}
+    new_items = price_history.strip_stats(new_items)
+
+    if dry_run:
+        # 아무것도 쓰지 않고 메모리에서만 합쳐봅니다
+        updated_data = new_items + [item for item in product_store.load_all() if item.get('date') != today_str]
+        update_html_file(updated_data, new_items, changed_dates=[today_str, *pruned_dates], dry_run=True, badges=badges)
+        return
+
+    # 1. 오늘 날짜 파티션만 저장 (같은 날짜가 이미 있으면 덮어쓰기)
+    #    전체 파일을 다시 쓰지 않습니다. 합치기는 `python -m src.product_store compact`
+    product_store.save_day(new_items)
+    print(f"   - {today_str} 파티션 저장 ({len(new_items)}개)")
+
+    # 2. 화면 생성을 위해 전체 기록 불러오기 (최신 날짜가 위로)
+    if USE_SQLITE:
+        conn = sqlite_store.connect()
+        sqlite_store.ensure_ready(conn)
+        sqlite_store.upsert_day(new_items, conn)
+        updated_data = sqlite_store.load_all(conn)
+        today_items = sqlite_store.items_for_date(sqlite_store.latest_date(conn), conn)
+        conn.close()
+    else:
+        updated_data = product_store.load_all()
+        today_items = None
+        # 이미 읽은 전체 기록으로 가격 이력 캐시를 갱신 (다음 실행의 가격 분석이 기록 JSON 을 다시 읽지 않음)
+        price_history.refresh_cache(updated_data)
     print(f"✅ 총 {len(updated_data)}개의 상품 데이터가 저장되었습니다.")
 
-    # 5. [NEW] HTML 파일(웹사이트 화면) 자동 업데이트
-    update_html_file(updated_data)
+    # 3. [NEW] HTML 파일(웹사이트 화면) 자동 업데이트
+    update_html_file(updated_data, today_items, changed_dates=[today_str, *pruned_dates], badges=badges)
+
+def _thumb_formats():
+    # 지난 날짜 카드의 <picture> 후보 (선호 순서: avif -> webp)
+    return [ext for ext, _, _ in reversed(optimize_image.thumb_formats())]
 
-def update_html_file(data):
+def _render_hash(today_items, manifest_version, image_cutoff, badges):
+    """index.html 을 만드는 데 들어가는 모든 입력의 해시"""
+    sources = [get_template(name).source for name in ("index.html", "today_card.html")]
+    payload = json.dumps([sources, today_items, manifest_version, SEARCH_SHARDS, _thumb_formats(),
+                          optimize_image.THUMB_SIZES, image_cutoff, badges], ensure_ascii=False, sort_keys=True)
+    return _short_hash(payload)
+
+def _existing_render_hash():
+    # 기존 index.html 머리 부분의 <meta name="render-hash"> 값 읽기
+    try:
+        with open(HTML_FILE, "r", encoding="utf-8") as f:
+            head = f.read(1000)
+    except OSError:
+        return None
+    marker = '<meta name="render-hash" content="'
+    if marker not in head:
+        return None
+    return head.split(marker, 1)[1].split('"', 1)[0]
+
+def _price_badge_html(badge):
+    return f'<span class="price-badge">{badge}</span>' if badge else ""
+
+def update_html_file(data, today_items=None, changed_dates=None, dry_run=False, badges=None):
+    """badges: {상품 id: 가격 배지} (없으면 저장된 기록으로 다시 계산)"""
     if not data: return
+    writer = ArtifactWriter(dry_run=dry_run)
     
-    # 최신 날짜 데이터 추출
-    latest_date = data[0]['date']
-    today_items = [item for item in data if item['date'] == latest_date]
+    # 최신 날짜 데이터 추출 (DB에서 이미 뽑아왔으면 그대로 사용)
+    if today_items is None:
+        latest_date = data[0]['date']
+        today_items = [item for item in data if item['date'] == latest_date]
+    else:
+        latest_date = today_items[0]['date']
     
     # 날짜 포맷 (20251209 -> 12월 9일)
     dt = datetime.strptime(latest_date, "%Y%m%d")
     date_display = f"{dt.month}월 {dt.day}일"
 
-    # HTML 내용 작성 (요청하신 디자인 적용)
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="ko">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>3ILAB 골드박스</title>
-        <link href="https://fonts.googleapis.com/css2?family=Nanum+Gothic:wght@400;700;800&display=swap" rel="stylesheet">
-        <style>
-            :root {{ --primary-color: #E60023; --bg-color: #f8f9fa; }}
-            body {{ font-family: 'Nanum Gothic', sans-serif; background-color: var(--bg-color); margin: 0; padding: 0; padding-bottom: 50px; }}
-            
-            /* 1. 쿠팡 파트너스 문구 (최상단, 흐릿하게) */
-            .disclaimer {{
-                font-size: 0.7rem; color: #ccc; text-align: center; 
-                padding: 10px 0 5px 0; background-color: #fff;
-            }}
-
-            /* 2. 코웨이 홍보 배너 (중간 강조) */
-            .promo-banner {{
-                display: block;
-                background-color: #fff; 
-                border: 2px solid #03c75a; /* 네이버 그린 */
-                border-radius: 12px;
-                padding: 15px;
-                text-align: center;
-                margin: 20px auto;
-                max-width: 90%;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.05);
-                text-decoration: none; color: #333;
-                transition: transform 0.2s;
-            }}
-            .promo-banner:hover {{ transform: translateY(-2px); }}
-            .promo-banner b {{ color: #03c75a; }}
-
-            .container {{ max-width: 1000px; margin: 0 auto; padding: 0 15px; }}
-            .section-title {{ color: #333; border-left: 5px solid var(--primary-color); padding-left: 10px; margin: 30px 0 15px 0; font-size: 1.3rem; }}
-
-            /* 상품 카드 디자인 */
-            .product-grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(160px, 1fr)); gap: 15px; }}
-            .card {{ background: white; border-radius: 10px; overflow: hidden; box-shadow: 0 2px 5px rgba(0,0,0,0.05); cursor: pointer; transition: transform 0.2s; }}
-            .card:hover {{ transform: translateY(-3px); box-shadow: 0 5px 15px rgba(0,0,0,0.15); }}
-            
-            /* 이미지 비율 고정 (잘림 방지) */
-            .card-img-top {{ width: 100%; aspect-ratio: 1 / 1; object-fit: contain; background-color: white; }}
-            
-            .card-body {{ padding: 12px; }}
-            .rank-badge {{ background: var(--primary-color); color: white; padding: 2px 6px; border-radius: 4px; font-weight: bold; font-size: 0.8rem; margin-right: 5px; }}
-            .product-title {{ font-size: 0.9rem; margin: 5px 0; height: 2.7em; overflow: hidden; display: -webkit-box; -webkit-line-clamp: 2; -webkit-box-orient: vertical; }}
-            .product-price {{ font-size: 1.1rem; font-weight: 800; color: var(--primary-color); }}
-            .product-id {{ font-size: 0.7rem; color: #ccc; text-align: right; margin-top: 5px; }}
-
-            /* 달력 및 검색 */
-            .calendar-area {{ background: white; padding: 15px; border-radius: 10px; display: flex; gap: 10px; flex-wrap: wrap; justify-content: center; box-shadow: 0 2px 5px rgba(0,0,0,0.05); margin-bottom: 20px; }}
-            .date-btn {{ border: 1px solid #ddd; background: white; padding: 8px 15px; border-radius: 20px; cursor: pointer; font-size: 0.9rem; transition: 0.2s; }}
-            .date-btn:hover {{ background: #eee; }}
-            .date-btn.active {{ background: var(--primary-color); color: white; border-color: var(--primary-color); }}
-            .search-box {{ width: 100%; padding: 12px; border: 1px solid #ddd; border-radius: 8px; margin-bottom: 20px; box-sizing: border-box; }}
-            .loading {{ text-align: center; padding: 50px; color: #999; }}
-
-            @media (max-width: 600px) {{ .product-grid {{ grid-template-columns: repeat(2, 1fr); gap: 10px; }} }}
-        </style>
-    </head>
-    <body>
-
-        <div class="disclaimer">
-            이 포스팅은 쿠팡 파트너스 활동의 일환으로, 이에 따른 일정액의 수수료를 제공받습니다.
-        </div>
-
-        <div class="container">
-            <a href="https://naver.me/GWideWE6" target="_blank" class="promo-banner">
-                📢 <b>[설문조사]</b> 코웨이 제품 가장 유리한 조건으로<br>상담 받으러 가기 (클릭) 👇
-            </a>
-
-            <h2 class="section-title">🔥 {date_display} 골드박스 Top 10</h2>
-            
-            <div id="today-list" class="product-grid">
-                {''.join([f'''
-                <div class="card" onclick="window.open('{item['link']}', '_blank')">
-                    <img src="{item['image_url']}" class="card-img-top" loading="lazy" 
-                         onerror="this.src='https://via.placeholder.com/500x500/eee/999?text=No+Image'">
-                    <div class="card-body">
-                        <div><span class="rank-badge">{item['rank']}위</span></div>
-                        <div class="product-title">{item['name']}</div>
-                        <div class="product-price">{item['price']:,}원</div>
-                        <div class="product-id">No. {item['id']}</div>
-                    </div>
-                </div>
-                ''' for item in today_items])}
-            </div>
-
-            <hr style="margin: 40px 0; border: 0; border-top: 1px solid #ddd;">
-
-            <h2 class="section-title">📅 지난 날짜 & 검색</h2>
-            <input type="text" id="search-input" class="search-box" placeholder="상품명이나 번호로 검색" onkeyup="doSearch()">
-            <div class="calendar-area" id="calendar-buttons"></div>
-            <div id="archive-list" class="product-grid">
-                <div style="text-align: center; width: 100%; color: #aaa; padding: 20px;">
-                    날짜를 클릭하거나 검색하면 과거 상품이 나옵니다.
-                </div>
-            </div>
-        </div>
-
-        <script>
-            // 파이썬이 데이터를 여기에 심어줍니다
-            const allProducts = {json.dumps(data, ensure_ascii=False)};
-
-            // 초기화
-            function initApp() {{
-                const dates = [...new Set(allProducts.map(item => item.date))].sort().reverse();
-                
-                // 달력 버튼 만들기
-                const calContainer = document.getElementById('calendar-buttons');
-                dates.forEach(date => {{
-                    const btn = document.createElement('button');
-                    btn.className = 'date-btn';
-                    const label = date.substring(4,6) + "/" + date.substring(6,8);
-                    btn.innerText = label;
-                    btn.onclick = () => {{
-                        document.querySelectorAll('.date-btn').forEach(b => b.classList.remove('active'));
-                        btn.classList.add('active');
-                        renderArchive(date);
-                    }};
-                    calContainer.appendChild(btn);
-                }});
-            }}
-
-            // 과거 데이터 렌더링
-            function renderArchive(targetDate) {{
-                const container = document.getElementById('archive-list');
-                container.innerHTML = "";
-                const items = allProducts.filter(item => item.date === targetDate).sort((a, b) => a.rank - b.rank);
-                
-                items.forEach(item => {{
-                    const rankStr = String(item.rank).padStart(2, '0');
-                    const imgPath = `images/${{item.date}}/${{rankStr}}.jpg`;
-                    const html = `
-                    <div class="card" onclick="window.open('${{item.link}}', '_blank')">
-                        <img src="${{imgPath}}" class="card-img-top" onerror="this.src='https://via.placeholder.com/500?text=Expired'">
-                        <div class="card-body">
-                            <div><span class="rank-badge">${{item.date.substring(4)}} / ${{item.rank}}위</span></div>
-                            <div class="product-title">${{item.name}}</div>
-                            <div class="product-price">${{item.price.toLocaleString()}}원</div>
-                        </div>
-                    </div>`;
-                    container.innerHTML += html;
-                }});
-            }}
-
-            // 검색 기능
-            function doSearch() {{
-                const keyword = document.getElementById('search-input').value.toLowerCase();
-                const container = document.getElementById('archive-list');
-                if (keyword.length < 2) return;
-                
-                container.innerHTML = "";
-                const results = allProducts.filter(item => 
-                    item.name.toLowerCase().includes(keyword) || item.id.toLowerCase().includes(keyword)
-                );
-
-                if (results.length === 0) {{
-                    container.innerHTML = "<div class='loading'>검색 결과가 없습니다.</div>";
-                    return;
-                }}
-
-                results.forEach(item => {{
-                    const imgPath = `images/${{item.date}}/${{String(item.rank).padStart(2,'0')}}.jpg`;
-                    const html = `
-                    <div class="card" onclick="window.open('${{item.link}}', '_blank')">
-                        <img src="${{imgPath}}" class="card-img-top" onerror="this.src='https://via.placeholder.com/500?text=Expired'">
-                        <div class="card-body">
-                            <div><span class="rank-badge">${{item.date.substring(4)}} / ${{item.rank}}위</span></div>
-                            <div class="product-title">${{item.name}}</div>
-                            <div class="product-price">${{item.price.toLocaleString()}}원</div>
-                        </div>
-                    </div>`;
-                    container.innerHTML += html;
-                }});
-            }}
-
-            // 실행
-            initApp();
-        </script>
-    </body>
-    </html>
-    """
-    
-    with open(HTML_FILE, "w", encoding="utf-8") as f:
-        f.write(html_content)
-    print("✨ [HTML 업데이트] 디자인이 적용된 index.html 생성 완료!")
+    # 지난 기록은 페이지에 넣지 않고 조각 파일로 분리
+    search_versions = write_search_index(data, writer)
+    manifest_version = write_archive_shards(data, writer, search_versions, changed_dates)
+
+    if badges is None:
+        try:
+            badges = price_history.badges_by_id(today_items)
+        except Exception as e:
+            print(f"⚠️ 가격 배지 계산 실패 (배지 없이 진행): {e}")
+            badges = {}
+
+    # 이 날짜 이전 카드는 원본 JPEG 가 보존 기간이 지나 지워졌으므로 썸네일만 씁니다
+    image_cutoff = cleanup.image_cutoff(dt) or ""
+
+    # 입력이 지난번과 같으면 렌더링도, 파일 쓰기도 하지 않습니다
+    render_hash = _render_hash(today_items, manifest_version, image_cutoff, badges)
+    if render_hash == _existing_render_hash():
+        writer.unchanged += 1
+        writer.report()
+        print("✨ [HTML 업데이트] 변경 사항이 없어 index.html 을 그대로 둡니다.")
+        return writer
+
+    card = get_template("today_card.html")
+    today_cards = "".join(card.render(link=item['link'], image_url=item['image_url'], rank=item['rank'],
+                                      name=item['name'], price=f"{item['price']:,}", id=item['id'],
+                                      price_badge=_price_badge_html(badges.get(item['id'])))
+                          for item in today_items)
+
+    html_content = get_template("index.html").render(
+        render_hash=render_hash,
+        date_display=date_display,
+        today_cards=today_cards,
+        manifest_version=manifest_version,
+        search_shards=SEARCH_SHARDS,
+        thumb_formats=json.dumps(_thumb_formats()),
+        thumb_sizes=json.dumps(optimize_image.THUMB_SIZES),
+        image_cutoff=json.dumps(image_cutoff),
+    )
+    writer.write(HTML_FILE, html_content)
+    writer.report()
+    if not dry_run:
+        print("✨ [HTML 업데이트] 디자인이 적용된 index.html 생성 완료!")
+    return writer
 
 if __name__ == "__main__":
-    pass
+    # 저장된 기록으로 웹사이트만 다시 만들기
+    #   python -m src.update_db            : 실제로 생성
+    #   python -m src.update_db --dry-run  : 바뀔 파일만 출력
+    import sys
+    update_html_file(product_store.load_all(), dry_run="--dry-run" in sys.argv)
@@ -1,37 +1,41 @@
-import requests
-import json
 import os
-import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src import config, http_client, metrics, price_history
+
+# 그래프 API 주소 (로컬 스텁으로 테스트할 때 GRAPH_API_BASE 로 바꿀 수 있음)
+GRAPH_API_BASE = os.environ.get("GRAPH_API_BASE", "https://graph.facebook.com/v19.0")
+# 깃허브 페이지 주소 (기본: https://<GITHUB_ID>.github.io, 로컬 스텁은 PAGES_BASE_URL)
+PAGES_BASE_URL = os.environ.get("PAGES_BASE_URL")
+UPLOAD_WORKERS = 4          # 컨테이너 동시 생성 수
+POLL_FIRST_DELAY = 1.0      # 상태 확인 첫 대기(초), 이후 1.5배씩
+POLL_MAX_DELAY = 10.0
+POLL_TIMEOUT = 300          # 컨테이너 처리 최대 대기(초)
 
 # ============================================================================
-# 1. 설정 및 키 로드
+# 1. 설정 및 키 로드 (config 에서 처음 쓸 때 읽음 -> 키가 없어도 import 가능)
 # ============================================================================
 def load_secrets():
-    secrets = {}
-    path = "secrets.json"
-    if os.path.exists(path):
-        with open(path, "r", encoding="utf-8") as f:
-            secrets = json.load(f)
-    
     return {
-        "GITHUB_ID": secrets.get("GITHUB_ID") or os.environ.get("GITHUB_ID"),
-        "PAGE_ID": secrets.get("INSTA_PAGE_ID") or os.environ.get("INSTA_PAGE_ID"),
-        "TOKEN": secrets.get("INSTA_ACCESS_TOKEN") or os.environ.get("INSTA_ACCESS_TOKEN")
+        "GITHUB_ID": config.github_id(),
+        "PAGE_ID": config.get("INSTA_PAGE_ID"),
+        "TOKEN": config.get("INSTA_ACCESS_TOKEN"),
     }
 
-KEYS = load_secrets()
-GITHUB_ID = KEYS["GITHUB_ID"]
-PAGE_ID = KEYS["PAGE_ID"]
-TOKEN = KEYS["TOKEN"]
+def _page_id():
+    return config.get("INSTA_PAGE_ID")
+
+def _token():
+    return config.get("INSTA_ACCESS_TOKEN")
 
 # ============================================================================
 # 권한 점검 함수
 # ============================================================================
 def check_token_status():
     print("   🕵️ [진단] 토큰 및 권한 상태 확인 중...")
-    url = f"https://graph.facebook.com/v19.0/me/accounts?access_token={TOKEN}"
-    res = requests.get(url)
+    url = f"{GRAPH_API_BASE}/me/accounts?access_token={_token()}"
+    res = http_client.get(url)
     
     if res.status_code == 200:
         data = res.json()
@@ -49,13 +53,14 @@ def check_token_status():
 def upload_single_image(image_url, index):
     print(f"   📤 [업로드 {index+1}] 이미지 전송 중...")
     
-    url = f"https://graph.facebook.com/v19.0/{PAGE_ID}/media"
+    url = f"{GRAPH_API_BASE}/{_page_id()}/media"
     payload = {
         "image_url": image_url,
         "is_carousel_item": "true",
-        "access_token": TOKEN
+        "access_token": _token()
     }
-    res = requests.post(url, data=payload)
+    with metrics.span("instagram.upload", index=index):
+        res = http_client.post(url, data=payload)
     
     if res.status_code != 200 or "id" not in res.json():
         print(f"\n❌ [ERROR] {index+1}번째 이미지 업로드 실패!")
@@ -63,65 +68,147 @@ def upload_single_image(image_url, index):
         raise Exception(f"{index+1}번 이미지 업로드 중단")
         
     container_id = res.json()['id']
-    # 너무 빨리 요청하면 체할 수 있으니 2초 쉼
-    time.sleep(2) 
+    print(f"   ✅ [업로드 {index+1}] 컨테이너 생성 ({container_id})")
     return container_id
 
+def upload_images(image_urls, containers):
+    """
+    컨테이너를 최대 UPLOAD_WORKERS 개씩 동시에 만듭니다.
+    containers: {"인덱스": 컨테이너 ID} - 이미 있는 인덱스는 건너뜀 (이어하기)
+    """
+    todo = [i for i in range(len(image_urls)) if str(i) not in containers]
+    for i in range(len(image_urls)):
+        if str(i) in containers:
+            print(f"   ♻️ [업로드 {i+1}] 이전 컨테이너 재사용")
+
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+        futures = {i: pool.submit(upload_single_image, image_urls[i], i) for i in todo}
+        errors = []
+        for i, future in futures.items():
+            try:
+                containers[str(i)] = future.result()
+            except Exception as e:
+                errors.append(e)
+    if errors:
+        raise errors[0]
+    return [containers[str(i)] for i in range(len(image_urls))]
+
+# ============================================================================
+# 컨테이너 처리 상태 확인 (고정 대기 대신 FINISHED 가 될 때까지 폴링)
+# ============================================================================
+def get_status(container_id):
+    url = f"{GRAPH_API_BASE}/{container_id}"
+    res = http_client.get(url, params={"fields": "status_code", "access_token": _token()})
+    return res.json().get("status_code", "UNKNOWN")
+
+def wait_until_finished(container_ids, label="컨테이너"):
+    with metrics.span("instagram.wait_finished", label=label, containers=len(container_ids)):
+        _wait_until_finished(container_ids, label)
+
+def _wait_until_finished(container_ids, label):
+    pending = list(dict.fromkeys(container_ids))
+    delay = POLL_FIRST_DELAY
+    start = time.time()
+
+    while True:
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+            statuses = dict(zip(pending, pool.map(get_status, pending)))
+
+        failed = {cid: st for cid, st in statuses.items() if st in ("ERROR", "EXPIRED")}
+        if failed:
+            raise Exception(f"{label} 처리 실패: {failed}")
+        pending = [cid for cid, st in statuses.items() if st != "FINISHED"]
+        if not pending:
+            print(f"      ✅ {label} {len(container_ids)}개 처리 완료 ({time.time() - start:.1f}초)")
+            return
+
+        if time.time() - start > POLL_TIMEOUT:
+            raise Exception(f"{label} 처리 시간 초과 (남은 {len(pending)}개)")
+        print(f"      ⏳ {label} 처리 중 {len(pending)}개... {delay:.1f}초 뒤 다시 확인")
+        time.sleep(delay)
+        delay = min(delay * 1.5, POLL_MAX_DELAY)
+
 # ============================================================================
-# 3. 캐러셀 게시 (수정됨: 대기 시간 추가)
+# 3. 캐러셀 게시 (처리 완료를 확인한 뒤 바로 게시)
 # ============================================================================
-def publish_carousel(creation_ids, caption):
+def publish_carousel(creation_ids, caption, state=None):
+    state = {} if state is None else state
     print("\n   📦 [패키징] 캐러셀 컨테이너 묶는 중...")
     
-    # 1. 컨테이너 묶기
-    url_step1 = f"https://graph.facebook.com/v19.0/{PAGE_ID}/media"
+    # 1. 컨테이너 묶기 (이전 실행에서 만든 캐러셀이 있으면 재사용)
+    if state.get("carousel_id"):
+        print(f"      ♻️ 이전 캐러셀 재사용 (Creation ID: {state['carousel_id']})")
+        return _publish(state["carousel_id"], state)
+
+    url_step1 = f"{GRAPH_API_BASE}/{_page_id()}/media"
     payload_step1 = {
         "media_type": "CAROUSEL",
         "children": ",".join(creation_ids),
         "caption": caption,
-        "access_token": TOKEN
+        "access_token": _token()
     }
-    res1 = requests.post(url_step1, data=payload_step1)
+    res1 = http_client.post(url_step1, data=payload_step1)
     
     if "id" not in res1.json():
         print(f"\n❌ [ERROR] 캐러셀 생성 실패: {res1.text}")
         raise Exception("캐러셀 생성 실패")
         
     creation_id = res1.json()['id']
+    state["carousel_id"] = creation_id
     print(f"      ✅ 성공 (Creation ID: {creation_id})")
 
-    # -------------------------------------------------------------
-    # [핵심 수정] 인스타그램이 이미지를 처리할 시간을 줍니다 (60초)
-    # -------------------------------------------------------------
-    wait_time = 60
-    print(f"\n   ⏳ [대기] 인스타그램 서버 처리 대기 중 ({wait_time}초)...")
-    print("      (이 시간을 안 기다리면 'Media ID not available' 에러가 납니다)")
-    time.sleep(wait_time)
+    return _publish(creation_id, state)
+
+def _publish(creation_id, state):
+    # 캐러셀이 FINISHED 가 되기 전에 게시하면 'Media ID not available' 에러가 납니다
+    print("\n   ⏳ [대기] 캐러셀 처리 상태 확인 중...")
+    wait_until_finished([creation_id], label="캐러셀")
 
     # 2. 최종 게시
     print("   🚀 [발행] 최종 게시 요청 중...")
-    url_step2 = f"https://graph.facebook.com/v19.0/{PAGE_ID}/media_publish"
+    url_step2 = f"{GRAPH_API_BASE}/{_page_id()}/media_publish"
     payload_step2 = {
         "creation_id": creation_id,
-        "access_token": TOKEN
+        "access_token": _token()
     }
-    res2 = requests.post(url_step2, data=payload_step2)
+    # 최종 게시는 재시도하면 중복 게시될 수 있어서 재시도하지 않음
+    with metrics.span("instagram.publish"):
+        res2 = http_client.post(url_step2, data=payload_step2, retries=0)
     
     if "id" in res2.json():
         print(f"\n🎉 [성공] 인스타그램 업로드 완료! (Post ID: {res2.json()['id']})")
-        return True
+        state["post_id"] = res2.json()['id']
+        return res2.json()['id']
     else:
-        print(f"\n❌ [ERROR] 최종 발행 실패!")
+        print("\n❌ [ERROR] 최종 발행 실패!")
         print(f"   - 상세 에러: {res2.text}")
         raise Exception("최종 게시 실패")
 
+# ============================================================================
+# 업로드할 이미지 목록 (배포 확인 단계에서도 같은 목록을 사용)
+# ============================================================================
+def image_files(items):
+    """캐러셀에 들어가는 파일 이름 순서대로 (표지 + 상위 8개 + 엔딩)"""
+    return ["00_cover.jpg"] + [f"{item['rank']:02d}.jpg" for item in items[:8]] + ["11_end.jpg"]
+
+def build_image_urls(items, github_id=None):
+    date_str = items[0]['date']
+    site = PAGES_BASE_URL or f"https://{github_id or config.github_id()}.github.io"
+    base_url = f"{site}/images/{date_str}"
+    return [f"{base_url}/{name}" for name in image_files(items)]
+
 # ============================================================================
 # 4. 메인 실행
 # ============================================================================
-def main(items):
+def main(items, state=None):
+    """
+    state: 진행 상황을 담을 dict (컨테이너 ID, 캐러셀 ID, 게시물 ID).
+           이전 실행의 state 를 넘기면 이미 만든 컨테이너는 다시 만들지 않습니다.
+    """
+    state = {} if state is None else state
     print("\n🚀 [인스타그램 업로드 (디버그 모드)] 시작...")
     
-    if not GITHUB_ID or not PAGE_ID or not TOKEN:
+    if not all(load_secrets().values()):
         print("❌ secrets.json 정보가 누락되었습니다.")
         return
 
@@ -130,13 +217,7 @@ def main(items):
     date_str = items[0]['date']
     
     # 이미지 URL 준비
-    image_urls = []
-    base_url = f"https://{GITHUB_ID}.github.io/images/{date_str}"
-    
-    image_urls.append(f"{base_url}/00_cover.jpg") 
-    for item in items[:8]: 
-        image_urls.append(f"{base_url}/{item['rank']:02d}.jpg")
-    image_urls.append(f"{base_url}/11_end.jpg")
+    image_urls = build_image_urls(items)
 
     print(f"\n📸 업로드할 이미지 수: {len(image_urls)}장")
 
@@ -144,25 +225,30 @@ def main(items):
     dt_display = f"{date_str[4:6]}월 {date_str[6:8]}일"
     caption = f"🔥 {dt_display} 3ILAB 골드박스 BEST 8 🔥\n\n"
     caption += "오늘 단 하루 특가! 놓치면 손해인 상품들을 모았습니다.\n"
-    caption += f"👉 구매 링크는 프로필 상단 링크 클릭!\n"
-    caption += f"👉 상품 번호로 검색하면 더 빠르게 찾을 수 있어요.\n\n"
+    caption += "👉 구매 링크는 프로필 상단 링크 클릭!\n"
+    caption += "👉 상품 번호로 검색하면 더 빠르게 찾을 수 있어요.\n\n"
     
     for item in items:
         caption += f"[{item['rank']}위] {item['name']}\n"
-        caption += f"💰 {item['price']:,}원 (No.{item['id']})\n\n"
+        badge = price_history.price_badge(item)
+        caption += f"💰 {item['price']:,}원 (No.{item['id']})" + (f" 🏆 {badge}" if badge else "") + "\n\n"
         
     caption += ".\n.\n#쿠팡 #골드박스 #특가 #할인 #쇼핑 #살림템 #자취템 #육아템 #3ILAB"
 
-    # 업로드 실행
-    container_ids = []
+    # 업로드 실행 (URL 목록이 같을 때만 이전 컨테이너 재사용)
+    if state.get("image_urls") != image_urls:
+        state.clear()
+        state["image_urls"] = image_urls
+    containers = state.setdefault("containers", {})
     
     try:
-        for i, url in enumerate(image_urls):
-            c_id = upload_single_image(url, i)
-            container_ids.append(c_id)
+        container_ids = upload_images(image_urls, containers)
 
-        # 모두 성공하면 대기 후 게시
-        publish_carousel(container_ids, caption)
+        # 모든 이미지 컨테이너가 처리되면 바로 캐러셀로 묶어 게시
+        print("\n   ⏳ [대기] 이미지 컨테이너 처리 상태 확인 중...")
+        wait_until_finished(container_ids, label="이미지 컨테이너")
+        publish_carousel(container_ids, caption, state)
+        return state
         
     except Exception as e:
         print(f"\n🚨 [CRITICAL ERROR] 업로드 프로세스 중단됨: {e}")